@@ -0,0 +1,182 @@
+"""Offscreen frame export for replays, highlight clips and regression screenshots.
+
+    python export.py --out frames --seconds 300 --fps 30 --workers 8 --processes
+
+Runs GameController on SDL's dummy video driver, so no display is needed.
+The scripted bot plays, and the simulation is stepped as fast as the
+encoders keep up instead of in real time. Every frame is drawn with
+_draw_interface.
+
+PNG frames are copied out of the screen and handed to a pool of threads
+or processes through a bounded queue. When the queue is full the game
+either waits ('block') or skips the frame ('drop'). Files are numbered
+by frames written, so drops leave no gaps in the sequence. The 'raw'
+format writes each frame's pixel memory straight to frames.raw through
+a pygame.surfarray view, without copying it. frames.json records the
+pixel layout and the frame rate actually exported: frames are taken
+every whole number of simulation ticks, so e.g. --fps 24 becomes 30.
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Must be set before the display is created
+
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pygame
+
+from game import GameController, ScriptedPlayer, BLACK, SIM_HZ
+
+
+def _encode_png(data, size, path):
+    pygame.image.save(pygame.image.frombuffer(data, size, 'RGB'), path)
+
+
+class FrameExporter:
+    def __init__(self, out_dir, frame_format='png', workers=4, queue_size=32,
+                 backpressure='block', processes=False):
+        if backpressure not in ('block', 'drop'):
+            raise ValueError(f"Unknown backpressure mode: {backpressure}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.frame_format = frame_format
+        self.backpressure = backpressure
+        self.captured = 0
+        self.dropped = 0
+        self.error = None
+        self.frame_size = None
+        self.pixel_format = None
+        self.fps = None  # Set by export_session
+        if frame_format == 'png':
+            # Free slots in the bounded queue between the game and the encoders
+            self.slots = threading.BoundedSemaphore(queue_size)
+            if processes:
+                self.pool = ProcessPoolExecutor(max_workers=workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self.pool = ThreadPoolExecutor(max_workers=workers)
+        elif frame_format == 'raw':
+            self.raw_file = open(os.path.join(out_dir, 'frames.raw'), 'wb')
+        else:
+            raise ValueError(f"Unknown frame format: {frame_format}")
+
+    def submit(self, surface):
+        """Export one frame; returns False if it was dropped."""
+        index = self.captured - self.dropped  # Written frames only, so the files have no gaps
+        self.captured += 1
+        self.frame_size = surface.get_size()
+        if self.frame_format == 'raw':
+            self._write_raw(surface)
+            return True
+
+        if not self.slots.acquire(blocking=self.backpressure == 'block'):
+            self.dropped += 1
+            return False
+        # The screen is redrawn next frame, so PNG workers get their own copy
+        data = pygame.image.tobytes(surface, 'RGB')
+        path = os.path.join(self.out_dir, f"frame_{index:06d}.png")
+        self.pool.submit(_encode_png, data, self.frame_size, path).add_done_callback(self._encoded)
+        return True
+
+    def _encoded(self, future):
+        self.slots.release()
+        if future.exception() and self.error is None:
+            self.error = future.exception()
+
+    def _write_raw(self, surface):
+        if surface.get_bytesize() == 4 and surface.get_pitch() == surface.get_width() * 4:
+            # pixels2d is a (width, height) view of the surface memory, so its
+            # transpose is the row-major frame and can be written as-is
+            pixels = pygame.surfarray.pixels2d(surface)
+            self.raw_file.write(pixels.T)
+            del pixels  # Unlocks the surface
+            self.pixel_format = {'bytes_per_pixel': 4, 'masks': list(surface.get_masks()),
+                                 'byteorder': sys.byteorder}
+        else:
+            self.raw_file.write(pygame.image.tobytes(surface, 'RGBX'))
+            self.pixel_format = {'bytes_per_pixel': 4, 'order': 'RGBX'}
+
+    def close(self):
+        if self.frame_format == 'png':
+            self.pool.shutdown(wait=True)
+        else:
+            self.raw_file.close()
+        with open(os.path.join(self.out_dir, 'frames.json'), 'w') as f:
+            json.dump({'format': self.frame_format, 'size': self.frame_size, 'fps': self.fps,
+                       'frames': self.captured - self.dropped, 'dropped': self.dropped,
+                       'pixel_format': self.pixel_format}, f, indent=2)
+        if self.error:
+            raise self.error
+
+
+def export_session(exporter, seconds, fps=30, ghost_types=('minimax', 'a_star', 'rl')):
+    """Play `seconds` of simulated time with the bot and export frames at fps.
+
+    fps is rounded to a whole number of ticks per frame; the rate actually
+    used is stored in exporter.fps and returned.
+    """
+    if not 0 < fps <= SIM_HZ:
+        raise ValueError(f"fps must be between 1 and {SIM_HZ}, got {fps}")
+    ticks_per_frame = round(SIM_HZ / fps)
+    exporter.fps = SIM_HZ / ticks_per_frame
+    controller = GameController(ghost_types)
+    controller.state = "game"
+    bot = ScriptedPlayer()
+    over_ticks = 0
+
+    for tick in range(int(seconds * SIM_HZ)):
+        if controller.game_over:
+            # Hold the game over screen for a second, then start a new game
+            over_ticks += 1
+            if over_ticks >= SIM_HZ:
+                controller.reset_game()
+                over_ticks = 0
+        else:
+            player = controller.players[0]
+            move = None
+            if controller.sim_time - player.last_move_time >= controller.move_delay:
+                move = bot.decide_move(controller)
+            controller.step(move)
+
+        if tick % ticks_per_frame == 0:
+            controller.screen.fill(BLACK)
+            controller._draw_interface()
+            exporter.submit(controller.screen)
+    return exporter.fps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render gameplay frames without a display.")
+    parser.add_argument('--out', default='frames', help="output directory")
+    parser.add_argument('--seconds', type=float, default=60, help="simulated seconds to render")
+    parser.add_argument('--fps', type=int, default=30, help=f"frames per simulated second (max {SIM_HZ})")
+    parser.add_argument('--format', choices=['png', 'raw'], default='png')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="PNG encoder workers")
+    parser.add_argument('--processes', action='store_true', help="encode in processes instead of threads")
+    parser.add_argument('--queue', type=int, default=32, help="frames allowed to wait for an encoder")
+    parser.add_argument('--backpressure', choices=['block', 'drop'], default='block',
+                        help="wait for a free encoder, or drop the frame")
+    parser.add_argument('--ghosts', default='minimax,a_star,rl', help="ghost AI types")
+    args = parser.parse_args(argv)
+
+    exporter = FrameExporter(args.out, args.format, args.workers, args.queue,
+                             args.backpressure, args.processes)
+    start = time.perf_counter()
+    try:
+        fps = export_session(exporter, args.seconds, args.fps, tuple(args.ghosts.split(',')))
+    finally:
+        exporter.close()
+    if fps != args.fps:
+        print(f"--fps {args.fps} does not divide the {SIM_HZ} Hz simulation, exported at {fps:g} fps")
+    elapsed = time.perf_counter() - start
+    print(f"{exporter.captured - exporter.dropped} frames ({exporter.dropped} dropped) for "
+          f"{args.seconds:.0f}s of play in {elapsed:.1f}s ({args.seconds / elapsed:.1f}x real time)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
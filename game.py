@@ -1,10 +1,16 @@
 import pygame
 import numpy as np
 import heapq
-import tensorflow as tf
+import mmap
+import struct
+from collections import deque
 from pygame.locals import *
 import random
 import sys
+import os
+import threading
+import time
+import multiprocessing
 
 # Initialize Pygame and colors
 pygame.init()
@@ -17,6 +23,53 @@ GREEN = (0, 255, 0)
 PURPLE = (128, 0, 128)  # For destination
 GHOST_COLORS = [(255, 0, 0), (0, 255, 255), (255, 192, 203)]  # Blinky, Inky, Pinky
 
+# Simulation timing: rules advance in fixed steps, rendering runs as fast as it can
+SIM_HZ = 60
+SIM_STEP_MS = 1000 / SIM_HZ
+MAX_SIM_STEPS_PER_FRAME = 5  # Catch-up cap so a slow frame can't snowball
+SHIFT_INTERVAL_MS = 15000  # Maze rotates every 15 seconds
+
+# SysFont lookups are slow, so fonts are created once per (size, bold) and shared
+_FONT_CACHE = {}
+
+def get_font(size, bold=False):
+    key = (size, bold)
+    if key not in _FONT_CACHE:
+        _FONT_CACHE[key] = pygame.font.SysFont('Arial', size, bold=bold)
+    return _FONT_CACHE[key]
+
+# The board is drawn at BOARD_OFFSET in the 1000x800 window, in tiles of up
+# to MAX_TILE_SIZE pixels; larger mazes get smaller tiles so they still fit
+BOARD_OFFSET = (100, 80)
+BOARD_PIXELS = 700
+MAX_TILE_SIZE = 40
+
+def tile_size_for(maze_size):
+    """Tile edge in pixels for a maze_size x maze_size board."""
+    return max(1, min(MAX_TILE_SIZE, BOARD_PIXELS // maze_size))
+
+def scale_ghost_images(ghost_images, tile_size):
+    """The ghost images resized for tile_size tiles (they are drawn for MAX_TILE_SIZE)."""
+    if tile_size == MAX_TILE_SIZE:
+        return ghost_images
+    return [pygame.transform.smoothscale(image, (tile_size, tile_size)) for image in ghost_images]
+
+def make_ghost_images():
+    """Create simple ghost images with different colors"""
+    ghost_images = []
+    for color in GHOST_COLORS:
+        surf = pygame.Surface((40, 40), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (20, 20), 15)
+        pygame.draw.rect(surf, color, (5, 20, 30, 15))
+        for i in range(5):
+            pygame.draw.circle(surf, color, (5 + i*7, 35), 4)
+        pygame.draw.circle(surf, WHITE, (14, 15), 5)
+        pygame.draw.circle(surf, WHITE, (26, 15), 5)
+        pygame.draw.circle(surf, BLACK, (14, 15), 2)
+        pygame.draw.circle(surf, BLACK, (26, 15), 2)
+        ghost_images.append(surf)
+    return ghost_images
+
 # =====================
 # Core Game Classes
 # =====================
@@ -30,22 +83,65 @@ class HexTile:
         self.neighbors = []
 
 class DynamicMaze:
-    def __init__(self, size=15):  # Larger maze size
+    def __init__(self, size=15, obstacles=None, pellets=None):  # Larger maze size
+        """Random maze, or one built from (size, size) obstacle and pellet grids."""
         self.size = size
+        self.rotation = 0  # Number of quarter turns applied so far
+        # Level files fix these; random mazes leave them to GameSimulation
+        self.spawns = None
+        self.ghost_spawns = None
+        self.destination = None
+        if obstacles is None:
+            obstacles, pellets = self.random_layout(size)
+        obstacles = np.asarray(obstacles, dtype=bool).tolist()
+        pellets = np.asarray(pellets, dtype=bool).tolist()
+        self.tiles = [[HexTile(x, y, has_pellet=pellets[x][y], is_obstacle=obstacles[x][y])
+                       for y in range(size)] for x in range(size)]
+        self._init_connections()
+
+    @staticmethod
+    def random_layout(size):
+        """Random (obstacles, pellets) boolean grids, indexed [x][y] like tiles."""
+        draws = np.random.random((size, size, 2))  # Same draw order as rolling tile by tile
         # Fewer obstacles and more pellets
-        self.tiles = [[HexTile(x, y, has_pellet=(np.random.random() > 0.3), 
-                      is_obstacle=(np.random.random() < 0.15))  # More open space
-                     for y in range(size)] for x in range(size)]
+        pellets = draws[..., 0] > 0.3
+        obstacles = draws[..., 1] < 0.15  # More open space
         # Ensure starting positions are clear
-        self.tiles[1][1].obstacle = False
-        self.tiles[size-2][size-2].obstacle = False
-        self._init_connections()
-        
+        obstacles[1, 1] = obstacles[size-2, size-2] = False
+        return obstacles, pellets
+
+    def save(self, path):
+        """Write the maze as it currently stands to a level file.
+
+        spawns, ghost_spawns and destination are kept as loaded, so they are
+        turned with the tiles to where they are now.
+        """
+        obstacles = [[tile.obstacle for tile in row] for row in self.tiles]
+        pellets = [[tile.pellets > 0 for tile in row] for row in self.tiles]
+        spawns = [self.rotated(pos) for pos in self.spawns or ()]
+        ghost_spawns = [self.rotated(pos) for pos in self.ghost_spawns or ()]
+        destination = self.rotated(self.destination) if self.destination else None
+        with open(path, 'wb') as f:
+            f.write(encode_level(obstacles, pellets, spawns, ghost_spawns, destination))
+
+    def rotated(self, pos):
+        """Where the tile that started at pos is after the rotations so far."""
+        x, y = pos
+        for _ in range(self.rotation % 4):
+            x, y = self.size - 1 - y, x  # The quarter turn of shift_tiles
+        return (x, y)
+
+    @classmethod
+    def load(cls, path):
+        return LevelFile.open(path).to_maze()
+
     def _init_connections(self):
         # Connect hexagonal neighbors
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, 1), (1, -1)]
         for x in range(self.size):
             for y in range(self.size):
+                # Start fresh: shift_tiles reconnects after every rotation
+                self.tiles[x][y].neighbors = []
                 for dx, dy in directions:
                     nx, ny = x + dx, y + dy
                     if 0 <= nx < self.size and 0 <= ny < self.size:
@@ -63,6 +159,7 @@ class DynamicMaze:
         for x in range(self.size):
             for y in range(self.size):
                 self.tiles[x][y].grid_pos = (x, y)
+        self.rotation += 1
     
         self._init_connections()  # Reconnect neighbors
 
@@ -76,6 +173,90 @@ class DynamicMaze:
             if not self.tiles[x][y].obstacle:
                 return (x, y)
 
+# Level files: header, spawn coordinates (int32 x, y pairs, players then
+# ghosts), then the obstacle and pellet bitmasks. Tile (x, y) is bit
+# x * size + y, least significant bit first. Everything is little-endian.
+LEVEL_MAGIC = b'HMLV'
+LEVEL_VERSION = 1
+# magic, version, reserved, size, destination x, destination y, player spawns, ghost spawns
+LEVEL_HEADER = struct.Struct('<4sHHIiiHH')
+NO_DESTINATION = -1
+
+def encode_level(obstacles, pellets, spawns=(), ghost_spawns=(), destination=None):
+    """Serialize (size, size) obstacle and pellet grids into level file bytes."""
+    obstacles = np.asarray(obstacles, dtype=bool)
+    pellets = np.asarray(pellets, dtype=bool)
+    size = obstacles.shape[0]
+    dest_x, dest_y = destination or (NO_DESTINATION, NO_DESTINATION)
+    header = LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, 0, size, dest_x, dest_y,
+                               len(spawns), len(ghost_spawns))
+    coords = np.array(list(spawns) + list(ghost_spawns), dtype='<i4').reshape(-1, 2)
+    return b''.join([header, coords.tobytes(),
+                     np.packbits(obstacles.ravel(), bitorder='little').tobytes(),
+                     np.packbits(pellets.ravel(), bitorder='little').tobytes()])
+
+class LevelFile:
+    """A level file read in place from a buffer, usually a memory map.
+
+    Opening parses only the header and spawns. Tiles are read straight from
+    the bitmasks when asked for, so a multi-megabyte level opens instantly.
+    """
+    def __init__(self, buffer, offset=0):
+        start = offset
+        (magic, version, _, self.size, dest_x, dest_y,
+         n_spawns, n_ghost_spawns) = LEVEL_HEADER.unpack_from(buffer, offset)
+        if magic != LEVEL_MAGIC:
+            raise ValueError("Not a level file")
+        if version != LEVEL_VERSION:
+            raise ValueError(f"Unsupported level file version: {version}")
+        offset += LEVEL_HEADER.size
+        coords = np.frombuffer(buffer, dtype='<i4', count=2 * (n_spawns + n_ghost_spawns),
+                               offset=offset).reshape(-1, 2)
+        offset += coords.nbytes
+        coords = [(int(x), int(y)) for x, y in coords]
+        self.spawns = coords[:n_spawns]
+        self.ghost_spawns = coords[n_spawns:]
+        self.destination = None if dest_x == NO_DESTINATION else (dest_x, dest_y)
+
+        mask_bytes = (self.size * self.size + 7) // 8
+        self.obstacle_bits = np.frombuffer(buffer, dtype=np.uint8, count=mask_bytes, offset=offset)
+        self.pellet_bits = np.frombuffer(buffer, dtype=np.uint8, count=mask_bytes,
+                                         offset=offset + mask_bytes)
+        self.nbytes = offset + 2 * mask_bytes - start
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            # The arrays keep the map alive after the file is closed
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _bit(self, bits, x, y):
+        i = x * self.size + y
+        return bool(bits[i >> 3] >> (i & 7) & 1)
+
+    def is_obstacle(self, x, y):
+        return self._bit(self.obstacle_bits, x, y)
+
+    def has_pellet(self, x, y):
+        return self._bit(self.pellet_bits, x, y)
+
+    def _grid(self, bits):
+        return np.unpackbits(bits, count=self.size * self.size,
+                             bitorder='little').reshape(self.size, self.size).astype(bool)
+
+    def obstacles(self):
+        return self._grid(self.obstacle_bits)
+
+    def pellets(self):
+        return self._grid(self.pellet_bits)
+
+    def to_maze(self):
+        maze = DynamicMaze(self.size, self.obstacles(), self.pellets())
+        maze.spawns = list(self.spawns) or None
+        maze.ghost_spawns = list(self.ghost_spawns) or None
+        maze.destination = self.destination
+        return maze
+
 class Player:
     def __init__(self, color):
         self.tokens = []
@@ -83,18 +264,23 @@ class Player:
         self.color = color
         self.home_position = (0, 0)
         self.lives = 5  # More lives for easier gameplay
-        self.invincible = 0  # Invincibility frames after respawn
+        self.invincible = 0  # Invincibility ticks after respawn
         self.pellets_collected = 0  # Track pellets for bonuses
+        self.last_move_time = 0
+        self.prev_pos = None  # Grid position before the last tick, for interpolation
+        self.active = False  # Controlled by someone: takes moves and can be caught
 
 class Ghost:
-    def __init__(self, ai_type, color_index):
+    def __init__(self, ai_type, color_index, ai=None):
         self.ai_type = ai_type
-        self.color = GHOST_COLORS[color_index]
+        self.color = GHOST_COLORS[color_index % len(GHOST_COLORS)]
         self.position = (0, 0)
-        self.ai = self._init_ai()
+        self.prev_position = (0, 0)
+        self.ai = ai if ai is not None else self._init_ai()  # Prebuilt AIs allow custom settings
 
         self.last_move_time = 0
         self.move_delay = 400  # 400ms = one tile every 0.4s, slower
+        self.caught = False  # Caught a player since its AI last decided
 
     def _init_ai(self):
         if self.ai_type == 'minimax':
@@ -103,14 +289,18 @@ class Ghost:
             return AStarPathfinder()
         elif self.ai_type == 'rl':
             return QLearningAI()
+        elif self.ai_type == 'tabular_rl':
+            return TabularQLearningAI()
+        elif self.ai_type == 'mcts':
+            return MCTSGhostAI()
         return None
 
-    def make_move(self, game_state):
-        current_time = pygame.time.get_ticks()
+    def make_move(self, game_state, current_time):
         if self.ai and current_time - self.last_move_time > self.move_delay:
             self.last_move_time = current_time
 
             next_pos = self.ai.decide_move(game_state, self.position)
+            self.caught = False  # The AI has now seen it
 
             # Ensure movement is only one tile away
             if next_pos and self._is_adjacent(self.position, next_pos):
@@ -132,7 +322,7 @@ class PopUpText:
         self.duration = duration
         self.timer = 0
         self.size = size
-        self.font = pygame.font.SysFont('Arial', size)
+        self.font = get_font(size)
         self.alpha = 255
         
     def update(self):
@@ -193,10 +383,10 @@ class AStarPathfinder:
         return path
     
     def decide_move(self, game_state, current_pos):
-        if not game_state['players'][0].tokens:
+        if not game_state['target']:
             return current_pos
             
-        player_pos = game_state['players'][0].tokens[0].grid_pos
+        player_pos = game_state['target'].tokens[0].grid_pos
         path = self.find_path(current_pos, player_pos, game_state['maze'])
         return path[0] if path else current_pos
 
@@ -205,7 +395,7 @@ class MinimaxAI:
         self.depth = depth
         
     def decide_move(self, game_state, current_pos):
-        if not game_state['players'][0].tokens:
+        if not game_state['target']:
             return current_pos
             
         best_move = current_pos
@@ -245,15 +435,17 @@ class MinimaxAI:
             return min_eval
     
     def _evaluate(self, state, pos):
-        if not state['players'][0].tokens:
+        if not state['target']:
             return 0
             
-        player_pos = state['players'][0].tokens[0].grid_pos
+        player_pos = state['target'].tokens[0].grid_pos
         distance = abs(pos[0]-player_pos[0]) + abs(pos[1]-player_pos[1])
         return -distance  # Negative because we want to minimize distance
 
 class QLearningAI:
-    def __init__(self):
+    def __init__(self, weights_path=None):
+        # Imported here so only the 'rl' ghost pays for loading TensorFlow
+        import tensorflow as tf
         self.model = tf.keras.Sequential([
             tf.keras.Input(shape=(6,)),
             tf.keras.layers.Dense(64, activation='relu'),
@@ -261,9 +453,11 @@ class QLearningAI:
             tf.keras.layers.Dense(4)
         ])
         self.model.compile(optimizer='adam', loss='mse')
+        if weights_path:
+            self.model.load_weights(weights_path)
 
     def decide_move(self, game_state, current_pos):  # Make sure this is inside the class
-        if not game_state['players'][0].tokens:
+        if not game_state['target']:
             return current_pos
         
         state_vector = self._process_state(game_state, current_pos)
@@ -293,7 +487,7 @@ class QLearningAI:
         return current_pos
     
     def _process_state(self, state, current_pos):
-        player_pos = state['players'][0].tokens[0].grid_pos if state['players'][0].tokens else (0,0)
+        player_pos = state['target'].tokens[0].grid_pos if state['target'] else (0,0)
         pellets_remaining = state['maze'].count_pellets()
         return np.array([
             current_pos[0], current_pos[1],
@@ -302,50 +496,531 @@ class QLearningAI:
             pellets_remaining
         ])
 
+class TabularQLearningAI:
+    """Q-learning ghost that keeps learning during play.
+
+    The state is discretized into the direction to the player, a distance
+    bucket, which of the four moves are blocked and the maze rotation phase,
+    so choosing and updating a move is a single table lookup. The table is a
+    .npy file opened memory-mapped: it loads instantly and every game process
+    using the same path reads and trains the same table. With learn=False the
+    table is opened read-only and only played, e.g. for evaluation.
+    """
+    ACTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
+    DISTANCE_BUCKETS = (1, 3, 6)  # <=1, <=3, <=6, farther
+    N_STATES = 9 * (len(DISTANCE_BUCKETS) + 1) * 16 * 4
+
+    def __init__(self, table_path='q_table.npy', alpha=0.2, gamma=0.9, epsilon=0.1, learn=True):
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.learn = learn
+        self.q_table = self._open_table(table_path)
+        self.reset()
+
+    def reset(self):
+        """Forget the previous move, so a new game starts without a stale update."""
+        self.last_state = None
+        self.last_action = None
+        self.last_distance = None
+        self.last_target = None
+        self.last_rotation = None
+
+    def _open_table(self, path):
+        shape = (self.N_STATES, len(self.ACTIONS))
+        if path is None:
+            return np.zeros(shape, dtype=np.float32)  # Private, in-memory table
+        if self.learn and not os.path.exists(path):
+            # Build the file aside and link it into place, so concurrent
+            # processes all end up mapping the same file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=shape).flush()
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp_path)
+        table = np.load(path, mmap_mode='r+' if self.learn else 'r')
+        if table.shape != shape:
+            raise ValueError(f"{path} has shape {table.shape}, expected {shape}")
+        return table
+
+    def _encode_state(self, maze, current_pos, player_pos):
+        dx = player_pos[0] - current_pos[0]
+        dy = player_pos[1] - current_pos[1]
+        direction = ((dx > 0) - (dx < 0) + 1) * 3 + ((dy > 0) - (dy < 0) + 1)
+        distance = abs(dx) + abs(dy)
+        bucket = sum(distance > limit for limit in self.DISTANCE_BUCKETS)
+
+        blocked = 0
+        for i, (ax, ay) in enumerate(self.ACTIONS):
+            nx, ny = current_pos[0] + ax, current_pos[1] + ay
+            if not (0 <= nx < maze.size and 0 <= ny < maze.size) or maze.tiles[nx][ny].obstacle:
+                blocked |= 1 << i
+
+        state = ((direction * 4 + bucket) * 16 + blocked) * 4 + maze.rotation % 4
+        return state, distance, blocked
+
+    def _reward(self, distance, caught, comparable):
+        if caught:
+            return 10.0  # This ghost caught a player since its last move
+        if not comparable:
+            # The maze turned or the target changed, so the distance jump
+            # says nothing about the last move
+            return -0.1
+        return (self.last_distance - distance) - 0.1  # Closing in, minus a step cost
+
+    def decide_move(self, game_state, current_pos):
+        player = game_state['target']
+        if not player:
+            return current_pos
+
+        maze = game_state['maze']
+        state, distance, blocked = self._encode_state(maze, current_pos, player.tokens[0].grid_pos)
+
+        # Learn from the outcome of the previous move
+        if self.learn and self.last_state is not None:
+            comparable = player is self.last_target and maze.rotation == self.last_rotation
+            target = (self._reward(distance, game_state['caught'], comparable) +
+                      self.gamma * self.q_table[state].max())
+            self.q_table[self.last_state, self.last_action] += \
+                self.alpha * (target - self.q_table[self.last_state, self.last_action])
+
+        valid_actions = [a for a in range(len(self.ACTIONS)) if not blocked & (1 << a)]
+        if not valid_actions:
+            self.last_state = None
+            return current_pos
+        if random.random() < self.epsilon:
+            action = random.choice(valid_actions)
+        else:
+            q_values = self.q_table[state]
+            action = max(valid_actions, key=lambda a: q_values[a])
+
+        self.last_state, self.last_action = state, action
+        self.last_distance, self.last_target, self.last_rotation = distance, player, maze.rotation
+        dx, dy = self.ACTIONS[action]
+        return (current_pos[0] + dx, current_pos[1] + dy)
+
+class ScriptedPlayer:
+    """Bot for players[0], used by the tournament, frame export and soak runs.
+
+    It collects the nearest pellets until it has pellet_quota of them, then
+    heads for the destination. Tiles next to a ghost are avoided whenever a
+    path around them exists; cornered next to a ghost, it steps to the tile
+    farthest from the ghosts.
+    """
+    MOVES = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # W, S, A, D
+
+    def __init__(self, pellet_quota=0):
+        self.pellet_quota = pellet_quota
+
+    def decide_move(self, sim):
+        player = sim.players[0]
+        if not player.tokens:
+            return None
+        maze = sim.maze
+        start = player.tokens[0].grid_pos
+        ghosts = [ghost.position for ghost in sim.ghosts]
+        danger = {(gx + dx, gy + dy) for gx, gy in ghosts for dx, dy in self.MOVES + [(0, 0)]}
+
+        goals = []
+        if player.pellets_collected < self.pellet_quota:
+            goals.append(lambda pos: maze.tiles[pos[0]][pos[1]].pellets > 0)
+        if sim.destination:
+            goals.append(lambda pos: pos == sim.destination)
+
+        for is_goal in goals:
+            move = self._first_step(maze, start, is_goal, danger)
+            if move:
+                return move
+        if start in danger:
+            return self._flee(maze, start, ghosts)
+        for is_goal in goals:
+            move = self._first_step(maze, start, is_goal, set())
+            if move:
+                return move
+        return None
+
+    def _first_step(self, maze, start, is_goal, blocked):
+        """Breadth-first search; returns the first move of a shortest path to a goal tile."""
+        first_moves = {start: None}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            if pos != start and is_goal(pos):
+                return first_moves[pos]
+            for dx, dy in self.MOVES:
+                nxt = (pos[0] + dx, pos[1] + dy)
+                if (nxt in first_moves or nxt in blocked or
+                        not (0 <= nxt[0] < maze.size and 0 <= nxt[1] < maze.size) or
+                        maze.tiles[nxt[0]][nxt[1]].obstacle):
+                    continue
+                first_moves[nxt] = first_moves[pos] or (dx, dy)
+                queue.append(nxt)
+        return None
+
+    def _flee(self, maze, start, ghosts):
+        best_move, best_distance = None, -1
+        for dx, dy in self.MOVES:
+            x, y = start[0] + dx, start[1] + dy
+            if not (0 <= x < maze.size and 0 <= y < maze.size) or maze.tiles[x][y].obstacle:
+                continue
+            distance = min((abs(x - gx) + abs(y - gy) for gx, gy in ghosts), default=0)
+            if distance > best_distance:
+                best_move, best_distance = (dx, dy), distance
+        return best_move
+
+class _RolloutState:
+    """Minimal copy of the game used by MCTS rollouts.
+
+    Obstacles are a tuple of tuples indexed [x][y] like maze.tiles, so a
+    rotation is a cheap zip and copies can share it. Rotations follow
+    DynamicMaze.shift_tiles: the player rides its tile, the ghost stays put.
+    """
+    __slots__ = ('obstacles', 'ghost', 'player', 'time_to_shift', 'ghost_delay', 'player_delay')
+    ACTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    def __init__(self, obstacles, ghost, player, time_to_shift, ghost_delay, player_delay):
+        self.obstacles = obstacles
+        self.ghost = ghost
+        self.player = player
+        self.time_to_shift = time_to_shift
+        self.ghost_delay = ghost_delay
+        self.player_delay = player_delay
+
+    @classmethod
+    def from_game(cls, game_state, ghost_pos, ghost_delay, player_delay):
+        maze = game_state['maze']
+        obstacles = tuple(tuple(tile.obstacle for tile in row) for row in maze.tiles)
+        return cls(obstacles, ghost_pos, game_state['target'].tokens[0].grid_pos,
+                   game_state.get('time_to_shift', SHIFT_INTERVAL_MS), ghost_delay, player_delay)
+
+    def copy(self):
+        return _RolloutState(self.obstacles, self.ghost, self.player,
+                             self.time_to_shift, self.ghost_delay, self.player_delay)
+
+    def moves_from(self, pos):
+        size = len(self.obstacles)
+        moves = []
+        for dx, dy in self.ACTIONS:
+            x, y = pos[0] + dx, pos[1] + dy
+            if 0 <= x < size and 0 <= y < size and not self.obstacles[x][y]:
+                moves.append((dx, dy))
+        return moves
+
+    def _player_step(self, rng):
+        moves = self.moves_from(self.player)
+        if not moves:
+            return self.player
+        if rng.random() < 0.5:
+            # Evasive half the time, random otherwise
+            move = max(moves, key=lambda m: abs(self.player[0] + m[0] - self.ghost[0]) +
+                                            abs(self.player[1] + m[1] - self.ghost[1]))
+        else:
+            move = rng.choice(moves)
+        return (self.player[0] + move[0], self.player[1] + move[1])
+
+    def advance(self, move, rng):
+        """Apply one ghost move and the player moves and rotation that follow it.
+
+        Returns True if the ghost catches the player.
+        """
+        self.ghost = (self.ghost[0] + move[0], self.ghost[1] + move[1])
+        if self.ghost == self.player:
+            return True
+        for _ in range(max(1, self.ghost_delay // self.player_delay)):
+            self.player = self._player_step(rng)
+            if self.player == self.ghost:
+                return True
+        self.time_to_shift -= self.ghost_delay
+        if self.time_to_shift <= 0:
+            # Same quarter turn as np.rot90 in DynamicMaze.shift_tiles
+            self.obstacles = tuple(zip(*self.obstacles))[::-1]
+            self.player = (len(self.obstacles) - 1 - self.player[1], self.player[0])
+            self.time_to_shift += SHIFT_INTERVAL_MS
+            return self.player == self.ghost
+        return False
+
+
+class _MCTSNode:
+    """A decision point: where the ghost and the player are before the ghost moves."""
+    __slots__ = ('ghost', 'player', 'children', 'visits', 'total')
+
+    def __init__(self, ghost, player):
+        self.ghost = ghost
+        self.player = player
+        self.children = {}  # ghost move -> _MCTSEdge
+        self.visits = 0
+        self.total = 0.0
+
+    def reroot(self, ghost_pos, player_pos, max_player_offset=2):
+        """Return the subtree for where the ghost and player are now.
+
+        Prefers the outcome the search saw for the ghost's real move and the
+        player's real response. Otherwise falls back to the outcome of that
+        ghost move whose player was closest, if within max_player_offset
+        tiles: its statistics are slightly off, but far better than none,
+        and decide_move never picks a move that is blocked now.
+        """
+        if (ghost_pos, player_pos) == (self.ghost, self.player):
+            return self
+        best, best_offset = None, max_player_offset + 1
+        for edge in self.children.values():
+            for (ghost, player), node in edge.outcomes.items():
+                if ghost != ghost_pos:
+                    continue
+                offset = abs(player[0] - player_pos[0]) + abs(player[1] - player_pos[1])
+                if offset < best_offset:
+                    best, best_offset = node, offset
+        if best is not None:
+            best.player = player_pos
+        return best
+
+
+class _MCTSEdge:
+    """A ghost move, branching on where the player went in response."""
+    __slots__ = ('outcomes', 'visits', 'total')
+
+    def __init__(self):
+        self.outcomes = {}  # (ghost, player) after the move -> _MCTSNode
+        self.visits = 0
+        self.total = 0.0
+
+
+# Search trees kept between moves, per (ghost, slot): (root, time_to_shift)
+# as of the search that grew them
+_MCTS_TREES = {}
+
+
+def _mcts_iterate(root, state, rng, exploration, horizon, discount):
+    node, path, depth, reward = root, [root], 0, None
+    while reward is None:
+        moves = state.moves_from(state.ghost)
+        if not moves:
+            break
+        untried = [m for m in moves if m not in node.children]
+        if untried:
+            move = rng.choice(untried)
+        else:
+            log_visits = np.log(node.visits)
+            move = max(moves, key=lambda m: node.children[m].total / node.children[m].visits +
+                       exploration * np.sqrt(log_visits / node.children[m].visits))
+        caught = state.advance(move, rng)
+        depth += 1
+        edge = node.children.get(move)
+        if edge is None:
+            edge = node.children[move] = _MCTSEdge()
+        path.append(edge)
+        if caught:
+            reward = discount ** depth
+            break
+        key = (state.ghost, state.player)
+        expanded = key not in edge.outcomes
+        if expanded:
+            edge.outcomes[key] = _MCTSNode(*key)
+        node = edge.outcomes[key]
+        path.append(node)
+        if expanded:
+            break
+
+    # Rollout: a noisy greedy chaser until the horizon
+    while reward is None and depth < horizon:
+        moves = state.moves_from(state.ghost)
+        if not moves:
+            break
+        if rng.random() < 0.75:
+            move = min(moves, key=lambda m: abs(state.ghost[0] + m[0] - state.player[0]) +
+                                            abs(state.ghost[1] + m[1] - state.player[1]))
+        else:
+            move = rng.choice(moves)
+        depth += 1
+        if state.advance(move, rng):
+            reward = discount ** depth
+    if reward is None:
+        distance = abs(state.ghost[0] - state.player[0]) + abs(state.ghost[1] - state.player[1])
+        reward = 0.1 * (1 - distance / (2 * len(state.obstacles)))
+
+    for visited in path:
+        visited.visits += 1
+        visited.total += reward
+
+
+def _mcts_search(root_state, time_budget, seed, tree_key, fresh=False,
+                 exploration=1.4, horizon=30, discount=0.95):
+    """Search from root_state for time_budget seconds.
+
+    Runs in the calling process or in a slot's worker. The tree from the
+    previous call is re-rooted on the node for the ghost's real move and
+    the player's real response (or the nearest response explored, see
+    _MCTSNode.reroot). It is dropped when the maze has rotated since, or
+    when fresh is set.
+    Returns the root's per-move (visits, total reward) and the number of
+    rollouts done.
+    """
+    rng = random.Random(seed)
+    root = None
+    if not fresh and tree_key in _MCTS_TREES:
+        previous, time_to_shift = _MCTS_TREES[tree_key]
+        # time_to_shift only goes up when the countdown wrapped, i.e. the maze turned
+        if root_state.time_to_shift <= time_to_shift:
+            root = previous.reroot(root_state.ghost, root_state.player)
+    if root is None:
+        root = _MCTSNode(root_state.ghost, root_state.player)
+    _MCTS_TREES[tree_key] = (root, root_state.time_to_shift)
+
+    deadline = time.perf_counter() + time_budget
+    rollouts = 0
+    while rollouts == 0 or time.perf_counter() < deadline:
+        _mcts_iterate(root, root_state.copy(), rng, exploration, horizon, discount)
+        rollouts += 1
+    return {move: (edge.visits, edge.total) for move, edge in root.children.items()}, rollouts
+
+
+def _mcts_worker(conn):
+    """Search loop for one MCTSGhostAI slot, so the slot's tree stays in this process."""
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        conn.send(_mcts_search(*request))
+    conn.close()
+
+
+class MCTSGhostAI:
+    """Monte Carlo Tree Search ghost.
+
+    Rollouts run on a lightweight copy of the game that includes upcoming
+    maze rotations. With more than one worker, each slot has its own process,
+    reached over a pipe, that grows its own tree from the same root (root
+    parallelization); the root statistics are summed. The tree branches on
+    the player's response to each ghost move, so after a real move it is
+    re-rooted on the node for where the ghost and player actually are (or
+    the closest the search explored); it is dropped when the maze turns.
+    rollouts_per_second reports search throughput.
+    """
+    def __init__(self, workers=None, time_budget=0.05, move_delay=400, player_move_delay=100):
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget = time_budget  # Seconds of search per move
+        self.move_delay = move_delay
+        self.player_move_delay = player_move_delay
+        self.tree_key = f"{os.getpid()}-{id(self)}"
+        self.slots = None  # (process, connection) per worker
+        self.fresh = True  # Discard the trees on the next search
+        self.last_rollouts = 0
+        self.rollouts_per_second = 0.0
+
+    def _get_slots(self):
+        if self.slots is None:
+            # Spawned workers don't inherit the display or TensorFlow threads
+            context = multiprocessing.get_context('spawn')
+            self.slots = []
+            for _ in range(self.workers):
+                conn, worker_conn = context.Pipe()
+                process = context.Process(target=_mcts_worker, args=(worker_conn,), daemon=True)
+                process.start()
+                worker_conn.close()
+                self.slots.append((process, conn))
+        return self.slots
+
+    def reset(self):
+        """Start the next search from scratch, e.g. on a new maze."""
+        self.fresh = True
+
+    def close(self):
+        if self.slots is not None:
+            for process, conn in self.slots:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+                process.join(timeout=2)
+            self.slots = None
+
+    def decide_move(self, game_state, current_pos):
+        if not game_state['target']:
+            return current_pos
+
+        root_state = _RolloutState.from_game(game_state, current_pos,
+                                             self.move_delay, self.player_move_delay)
+        fresh, self.fresh = self.fresh, False
+        start = time.perf_counter()
+        if self.workers <= 1:
+            results = [_mcts_search(root_state, self.time_budget, random.getrandbits(32),
+                                    (self.tree_key, 0), fresh)]
+        else:
+            slots = self._get_slots()
+            for slot, (_, conn) in enumerate(slots):
+                conn.send((root_state, self.time_budget, random.getrandbits(32),
+                           (self.tree_key, slot), fresh))
+            results = [conn.recv() for _, conn in slots]
+        elapsed = time.perf_counter() - start
+
+        # Only moves open right now; reused statistics may cover other ones
+        allowed = root_state.moves_from(current_pos)
+        visits = {}
+        for stats, _ in results:
+            for move, (count, _) in stats.items():
+                if move in allowed:
+                    visits[move] = visits.get(move, 0) + count
+        self.last_rollouts = sum(rollouts for _, rollouts in results)
+        self.rollouts_per_second = self.last_rollouts / elapsed if elapsed > 0 else 0.0
+
+        if not visits:
+            return current_pos
+        dx, dy = max(visits, key=visits.get)
+        return (current_pos[0] + dx, current_pos[1] + dy)
+
 # =====================
 # Game Implementation
 # =====================
-class GameController:
-    def __init__(self):
-        pygame.init()  # Ensure pygame is initialized
-        self.screen = pygame.display.set_mode((1000, 800))  # Larger window
-        pygame.display.set_caption("Hex Maze Chase")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont('Arial', 24)
-        self.title_font = pygame.font.SysFont('Arial', 40, bold=True)
-        
-        # Create simple ghost images with different colors
-        self.ghost_images = []
-        for color in GHOST_COLORS:
-            surf = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (20, 20), 15)
-            pygame.draw.rect(surf, color, (5, 20, 30, 15))
-            for i in range(5):
-                pygame.draw.circle(surf, color, (5 + i*7, 35), 4)
-            pygame.draw.circle(surf, WHITE, (14, 15), 5)
-            pygame.draw.circle(surf, WHITE, (26, 15), 5)
-            pygame.draw.circle(surf, BLACK, (14, 15), 2)
-            pygame.draw.circle(surf, BLACK, (26, 15), 2)
-            self.ghost_images.append(surf)
-        
-        self.maze = DynamicMaze()
+class GameSimulation:
+    """Game rules and state, advanced in fixed SIM_STEP_MS ticks.
+
+    Nothing here touches the display, so headless tools can drive it
+    directly; GameController adds the window, input and drawing on top.
+    """
+    def __init__(self, ghost_types=('minimax', 'a_star', 'rl'), maze_size=15, ghosts=None):
+        self.maze_size = maze_size
+        # Ghosts (and their AI models) are built once and reused across resets
+        if ghosts is None:
+            ghosts = [Ghost(ai_type, i) for i, ai_type in enumerate(ghost_types)]
+        self.ghosts = ghosts
+        self.move_delay = 100  # milliseconds between moves
+        self.active_slots = {0}  # Indices of controlled players; kept across resets
+        self.reset_game()
+
+    def reset_game(self, maze=None):
+        """Reset per-game state (maze, players, ghosts, timers)."""
+        self.maze = maze or DynamicMaze(self.maze_size)
         self.players = [Player(RED), Player(BLUE)]
-        self.ghosts = [
-            Ghost('minimax', 0),  # Blinky (red)
-            Ghost('a_star', 1),   # Inky (cyan)
-            Ghost('rl', 2)        # Pinky (pink)
-        ]
+        for index, player in enumerate(self.players):
+            player.active = index in self.active_slots
+        for ghost in self.ghosts:
+            ghost.last_move_time = 0
+            ghost.caught = False
+            if hasattr(ghost.ai, 'reset'):
+                ghost.ai.reset()  # AIs that remember the last game start clean
         self._init_positions()
-        self.state = "home"  # home or game
+        self.sim_time = 0.0  # Simulated milliseconds since the game started
+        self.ticks = 0
+        self.accumulator = 0.0  # Real time not yet consumed by a tick
         self.last_shift_time = 0
-        self.game_time = 0
         self.game_over = False
         self.victory = False
-        self.last_move_time = 0
-        self.move_delay = 100  # milliseconds between moves
-        self.popups = []  # For displaying animated text
-        self.destination = None  # Destination tile
-        self.set_new_destination()  # Initialize destination
+        self.destination = self.maze.destination  # Level files fix the destination
+        if self.destination is None:
+            self.set_new_destination()  # Initialize destination
+        self._record_positions()
+
+    def set_active(self, index, active):
+        """Mark a player slot as controlled (e.g. a client joined) or empty."""
+        if active:
+            self.active_slots.add(index)
+        else:
+            self.active_slots.discard(index)
+        self.players[index].active = active
 
     def set_new_destination(self):
         """Set a new random destination for the player to reach"""
@@ -358,27 +1033,259 @@ class GameController:
                     break
 
     def _init_positions(self):
+        spawns = self.maze.spawns or [(1, 1), (self.maze.size - 2, self.maze.size - 2)]
         for idx, player in enumerate(self.players):
-            start_x = 1 if idx == 0 else self.maze.size - 2
-            start_y = 1 if idx == 0 else self.maze.size - 2
+            start_x, start_y = spawns[idx % len(spawns)]
             player.home_position = (start_x, start_y)
             player.tokens = [self.maze.tiles[start_x][start_y]]
             player.invincible = 60  # 2 seconds of invincibility at start
 
         # Ghosts start near center but not too close to player
         center = self.maze.size // 2
-        ghost_positions = [
+        ghost_positions = self.maze.ghost_spawns or [
             (center+1, center+1),
             (center-1, center+1),
             (center+1, center-1)
         ]
         for i, ghost in enumerate(self.ghosts):
-            ghost.position = ghost_positions[i]
+            ghost.position = ghost_positions[i % len(ghost_positions)]
+
+    def _record_positions(self):
+        """Remember where everything is so the renderer can interpolate."""
+        for player in self.players:
+            player.prev_pos = player.tokens[0].grid_pos if player.tokens else None
+        for ghost in self.ghosts:
+            ghost.prev_position = ghost.position
+
+    def _notify(self, event, tile=None):
+        """Hook for game events ('pellet', 'life_up', 'level_complete', 'maze_shifted')."""
+        pass
+
+    def advance(self, frame_ms, move=None, moves=None):
+        """Consume frame_ms of real time in fixed ticks and return the render alpha.
+
+        At most MAX_SIM_STEPS_PER_FRAME ticks run per call; time beyond that
+        is dropped, so the rules slow down instead of spiralling on a slow
+        machine. The returned alpha (0..1) is how far real time has got
+        into the next tick.
+        """
+        self.accumulator += frame_ms
+        steps = 0
+        while self.accumulator >= SIM_STEP_MS and not self.game_over:
+            if steps == MAX_SIM_STEPS_PER_FRAME:
+                self.accumulator %= SIM_STEP_MS
+                break
+            self.step(move, moves)
+            self.accumulator -= SIM_STEP_MS
+            steps += 1
+        if self.game_over:
+            self.accumulator = 0.0
+        return self.accumulator / SIM_STEP_MS
+
+    def step(self, move=None, moves=None):
+        """Advance the game by exactly one tick.
+
+        move is the (dx, dy) held by players[0]; moves gives one entry per
+        player instead, for games with several active players.
+        """
+        self._record_positions()
+        self.ticks += 1
+        self.sim_time = self.ticks * SIM_STEP_MS
+
+        if moves is None:
+            moves = [move]
+        for player, player_move in zip(self.players, moves):
+            if (player_move and player.active and player.lives > 0 and
+                    self.sim_time - player.last_move_time >= self.move_delay):
+                if self._move_player(player_move, player):
+                    player.last_move_time = self.sim_time
+
+        # Shift maze every 15 seconds (slower)
+        if self.sim_time - self.last_shift_time > SHIFT_INTERVAL_MS:
+            self.maze.shift_tiles()
+            self.last_shift_time = self.sim_time
+            for player in self.players:
+                if player.tokens:
+                    x, y = player.tokens[0].grid_pos
+                    player.tokens[0] = self.maze.tiles[x][y]
+            # Don't interpolate across a rotation
+            self._record_positions()
+            self._notify('maze_shifted')
+
+        game_state = {
+            'maze': self.maze,
+            'players': self.players,
+            'ghosts': self.ghosts,
+            'turn_count': int(self.sim_time),
+            'destination': self.destination,
+            'time_to_shift': SHIFT_INTERVAL_MS - (self.sim_time - self.last_shift_time)
+        }
+
+        # Update ghosts, each chasing the nearest player still in the game
+        for ghost in self.ghosts:
+            game_state['target'] = self._nearest_target(ghost.position)
+            game_state['caught'] = ghost.caught
+            new_pos = ghost.make_move(game_state, self.sim_time)
+            # Only move if target tile is valid
+            if 0 <= new_pos[0] < self.maze.size and 0 <= new_pos[1] < self.maze.size:
+                if not self.maze.tiles[new_pos[0]][new_pos[1]].obstacle:
+                    ghost.position = new_pos
+
+        self._check_ghost_collisions()
+
+        # Decrease invincibility timers
+        for player in self.players:
+            if player.active and player.invincible > 0:
+                player.invincible -= 1
+
+    def _nearest_target(self, pos):
+        """The closest active player with lives left, or None."""
+        candidates = [player for player in self.players
+                      if player.active and player.lives > 0 and player.tokens]
+        return min(candidates, default=None,
+                   key=lambda player: abs(player.tokens[0].grid_pos[0] - pos[0]) +
+                                      abs(player.tokens[0].grid_pos[1] - pos[1]))
+
+    def _move_player(self, move, player=None):
+        player = player or self.players[0]
+        if not player.tokens:
+            return False
+        x, y = player.tokens[0].grid_pos
+        new_x, new_y = x + move[0], y + move[1]
+        if not (0 <= new_x < self.maze.size and 0 <= new_y < self.maze.size):
+            return False
+        new_tile = self.maze.tiles[new_x][new_y]
+        if new_tile.obstacle:
+            return False
+        player.tokens[0] = new_tile
+        self._check_pellet_collision(new_tile, player)
+        self._check_destination_reached(new_tile, player)
+        return True
+
+    def _check_pellet_collision(self, tile, player=None):
+        if tile.pellets > 0:
+            tile.pellets = 0
+            player = player or self.players[0]
+            player.score += 10
+            player.pellets_collected += 1
+            self._notify('pellet', tile)
+            
+            # Check for 5 pellet bonus
+            if player.pellets_collected % 5 == 0:
+                player.score += 5
+                
+            # Check for 20 pellet life bonus
+            if player.pellets_collected % 50 == 0:
+                self._notify('life_up', tile)
+                player.lives += 1
+
+    def _check_destination_reached(self, tile, player=None):
+        """Check if player reached the destination"""
+        if self.destination and tile.grid_pos == self.destination:
+            # Player reached destination - level complete!
+            self.victory = True
+            self.game_over = True
+            
+            # Add victory score bonus
+            (player or self.players[0]).score += 100
+            self._notify('level_complete', tile)
+
+    def _check_ghost_collisions(self):
+        active = [player for player in self.players if player.active]
+        for player in active:
+            if not player.tokens or player.invincible > 0 or player.lives <= 0:
+                continue
+
+            player_pos = player.tokens[0].grid_pos
+            for ghost in self.ghosts:
+                if ghost.position == player_pos:
+                    ghost.caught = True
+                    player.lives -= 1
+                    if player.lives > 0:
+                        # Respawn player with invincibility
+                        player.tokens[0] = self.maze.tiles[player.home_position[0]][player.home_position[1]]
+                        player.invincible = 90  # 3 seconds of invincibility
+                    break
+
+        # The game is lost once every active player is out of lives
+        if active and all(player.lives <= 0 for player in active):
+            self.game_over = True
+            self.victory = False
+
+class GameController(GameSimulation):
+    def __init__(self, ghost_types=('minimax', 'a_star', 'rl'), maze_factory=DynamicMaze):
+        """maze_factory() builds the maze for each new game, e.g. from a level pack."""
+        pygame.init()  # Ensure pygame is initialized
+        self.screen = pygame.display.set_mode((1000, 800))  # Larger window
+        pygame.display.set_caption("Hex Maze Chase")
+        self.clock = pygame.time.Clock()
+        self.font = get_font(24)
+        self.title_font = get_font(40, bold=True)
+        
+        self.ghost_images = make_ghost_images()
+
+        # Load the cover image once instead of on every homepage frame
+        try:
+            self.cover_image = pygame.transform.scale(pygame.image.load("cover.jpg"), (600, 400))
+        except (pygame.error, FileNotFoundError):
+            self.cover_image = None
+
+        self.state = "home"  # home or game
+        self.popups = []  # For displaying animated text
+        self.maze_factory = maze_factory
+        self._next_maze = None
+        self._maze_thread = None
+        super().__init__(ghost_types)
+
+    def reset_game(self):
+        """Reset per-game state; the display, fonts, sprites and ghost AIs are
+        kept, so restarting does not pay for pygame or TensorFlow setup again.
+        """
+        super().reset_game(self._take_next_maze())
+        self.popups = []
+        self._prefetch_maze()  # Build the next maze while this game is played
+
+    def step(self, move=None, moves=None):
+        super().step(move, moves)
+        self.popups = [popup for popup in self.popups if popup.update()]
+
+    def _notify(self, event, tile=None):
+        """Show simulation events as popups."""
+        if event == 'maze_shifted':
+            self.popups.append(PopUpText("Maze Shifted!", (400, 300), YELLOW, 60, 32))
+            return
+        pos = self.hex_to_pixel(tile.grid_pos, center=True)
+        if event == 'pellet':
+            self.popups.append(PopUpText("+10", (pos[0]-10, pos[1]-20), GREEN))
+        elif event == 'life_up':
+            self.popups.append(PopUpText("Life Up!", (pos[0]-30, pos[1]-60), RED, 90, 32))
+        elif event == 'level_complete':
+            self.popups.append(PopUpText("Level Complete!", (pos[0]-80, pos[1]-80), PURPLE, 120, 36))
+
+    def _prefetch_maze(self):
+        """Generate the next maze on a background thread."""
+        def build():
+            self._next_maze = self.maze_factory()
+        self._maze_thread = threading.Thread(target=build, daemon=True)
+        self._maze_thread.start()
+
+    def _take_next_maze(self):
+        """Return the prefetched maze, or build one if none is pending."""
+        if self._maze_thread is None:
+            return self.maze_factory()
+        self._maze_thread.join()
+        self._maze_thread = None
+        maze, self._next_maze = self._next_maze, None
+        return maze
+
+    @property
+    def tile_size(self):
+        return tile_size_for(self.maze.size)
 
     def hex_to_pixel(self, pos, center=False):
         """Convert hex grid coordinates to pixel coordinates"""
-        tile_size = 40
-        offset_x, offset_y = 100, 80
+        tile_size = self.tile_size
+        offset_x, offset_y = BOARD_OFFSET
         px = pos[0] * tile_size + offset_x
         py = pos[1] * tile_size + offset_y
         if center:
@@ -388,8 +1295,7 @@ class GameController:
 
     def draw_maze(self, highlight_path=False):
         """Draw the maze with optional path highlighting"""
-        tile_size = 40
-        offset_x, offset_y = 100, 80
+        tile_size = self.tile_size
         
         for x in range(self.maze.size):
             for y in range(self.maze.size):
@@ -415,7 +1321,7 @@ class GameController:
                 if tile.pellets > 0:
                     pellet_color = (255, 255, 100)  # Brighter yellow
                     pygame.draw.circle(self.screen, pellet_color, 
-                                     (px + tile_size//2, py + tile_size//2), 5)
+                                     (px + tile_size//2, py + tile_size//2), max(1, tile_size // 8))
                 
                 # Draw destination if this is the destination tile
                 if self.destination and (x, y) == self.destination:
@@ -526,12 +1432,10 @@ class GameController:
         title_text = self.title_font.render("Hex Maze Chase", True, YELLOW)
         self.screen.blit(title_text, (500 - title_text.get_width() // 2, 50))
 
-        # Try to load cover image, fall back to a placeholder if missing
-        try:
-            cover_image = pygame.image.load("cover.jpg")
-            cover_image = pygame.transform.scale(cover_image, (600, 400))
-            self.screen.blit(cover_image, (200, 150))
-        except pygame.error:
+        # Draw cover image, fall back to a placeholder if missing
+        if self.cover_image:
+            self.screen.blit(self.cover_image, (200, 150))
+        else:
             # Draw a placeholder rectangle if image is missing
             pygame.draw.rect(self.screen, (50, 50, 50), (200, 150, 600, 400))
             placeholder_text = self.font.render("Cover Image Missing", True, WHITE)
@@ -572,115 +1476,33 @@ class GameController:
                     self._check_pellet_collision(new_tile)
                     self._check_destination_reached(new_tile)
 
-    def _check_pellet_collision(self, tile):
-        if tile.pellets > 0:
-            tile.pellets = 0
-            player = self.players[0]
-            player.score += 10
-            player.pellets_collected += 1
-            
-            # Show +10 score popup
-            pos = self.hex_to_pixel(tile.grid_pos, center=True)
-            self.popups.append(PopUpText("+10", (pos[0]-10, pos[1]-20), GREEN))
-            
-            # Check for 5 pellet bonus
-            if player.pellets_collected % 5 == 0:
-                pos = self.hex_to_pixel(tile.grid_pos, center=True)
-                player.score += 5
-                
-            # Check for 20 pellet life bonus
-            if player.pellets_collected % 50 == 0:
-                pos = self.hex_to_pixel(tile.grid_pos, center=True)
-                self.popups.append(PopUpText("Life Up!", (pos[0]-30, pos[1]-60), RED, 90, 32))
-                player.lives += 1
-
-    def _check_destination_reached(self, tile):
-        """Check if player reached the destination"""
-        if self.destination and tile.grid_pos == self.destination:
-            # Player reached destination - level complete!
-            self.victory = True
-            self.game_over = True
-            
-            # Add victory score bonus
-            self.players[0].score += 100
-            pos = self.hex_to_pixel(tile.grid_pos, center=True)
-            self.popups.append(PopUpText("Level Complete!", (pos[0]-80, pos[1]-80), PURPLE, 120, 36))
-
-    def _check_ghost_collisions(self):
-        player = self.players[0]
-        if not player.tokens or player.invincible > 0:
-            return
-
-        player_pos = player.tokens[0].grid_pos
-        for ghost in self.ghosts:
-            if ghost.position == player_pos:
-                player.lives -= 1
-                if player.lives <= 0:
-                    self.game_over = True
-                    self.victory = False
-                else:
-                    # Respawn player with invincibility
-                    player.tokens[0] = self.maze.tiles[player.home_position[0]][player.home_position[1]]
-                    player.invincible = 90  # 3 seconds of invincibility
-                break
-
-    def _update_game(self, dt, current_time):
-        self.game_time = current_time
-        
-        # Shift maze every 15 seconds (slower)
-        if current_time - self.last_shift_time > 15000:
-            self.maze.shift_tiles()
-            self.last_shift_time = current_time
-            # After shifting, we might want to set a new destination
-            # But for now, keep the same destination (it moves with the maze)
-
-            # Show shift warning
-            warning = PopUpText("Maze Shifted!", (400, 300), YELLOW, 60, 32)
-            self.popups.append(warning)
-
-        game_state = {
-            'maze': self.maze,
-            'players': self.players,
-            'ghosts': self.ghosts,
-            'turn_count': current_time,
-            'destination': self.destination
-        }
-
-        # Update ghosts
-        for ghost in self.ghosts:
-            new_pos = ghost.make_move(game_state)
-            # Only move if target tile is valid
-            if 0 <= new_pos[0] < self.maze.size and 0 <= new_pos[1] < self.maze.size:
-                if not self.maze.tiles[new_pos[0]][new_pos[1]].obstacle:
-                    ghost.position = new_pos
-
-        self._check_ghost_collisions()
-        
-        # Decrease invincibility timer
-        if self.players[0].invincible > 0:
-            self.players[0].invincible -= 1
-        
-        # Update popups
-        self.popups = [popup for popup in self.popups if popup.update()]
-
-    def _draw_interface(self, current_time):
+    @staticmethod
+    def _interpolate(prev, current, alpha):
+        """Blend two grid positions; jumps (respawns) are not smoothed."""
+        if prev is None or abs(prev[0] - current[0]) + abs(prev[1] - current[1]) > 1:
+            return current
+        return (prev[0] + (current[0] - prev[0]) * alpha,
+                prev[1] + (current[1] - prev[1]) * alpha)
+
+    def _draw_interface(self, alpha=1.0):
         self.draw_maze()
+        half = self.tile_size // 2
 
-        # Draw player
+        # Draw player, interpolated between the last two simulation ticks
         player = self.players[0]
         if player.tokens:
-            x, y = player.tokens[0].grid_pos
-            px, py = self.maze.tiles[x][y].pixel_pos
+            px, py = self.hex_to_pixel(self._interpolate(player.prev_pos, player.tokens[0].grid_pos, alpha))
             # Flash if invincible
             if player.invincible <= 0 or (player.invincible // 10) % 2 == 0:
-                pygame.draw.circle(self.screen, player.color, (px + 20, py + 20), 15)
+                pygame.draw.circle(self.screen, player.color, (px + half, py + half), self.tile_size * 3 // 8)
 
         # Draw ghosts
+        ghost_images = scale_ghost_images(self.ghost_images, self.tile_size)
         for i, ghost in enumerate(self.ghosts):
-            x, y = ghost.position
-            tile = self.maze.tiles[x][y]
-            ghost_rect = self.ghost_images[i].get_rect(center=(tile.pixel_pos[0] + 20, 20 + tile.pixel_pos[1]))
-            self.screen.blit(self.ghost_images[i], ghost_rect)
+            px, py = self.hex_to_pixel(self._interpolate(ghost.prev_position, ghost.position, alpha))
+            image = ghost_images[i % len(ghost_images)]
+            ghost_rect = image.get_rect(center=(px + half, py + half))
+            self.screen.blit(image, ghost_rect)
 
         # Draw popups
         for popup in self.popups:
@@ -690,7 +1512,7 @@ class GameController:
         score_text = self.font.render(f"Score: {self.players[0].score}", True, WHITE)
         lives_text = self.font.render(f"Lives: {self.players[0].lives}", True, WHITE)
         pellets_text = self.font.render(f"Pellets: {self.maze.count_pellets()}", True, WHITE)
-        time_text = self.font.render(f"Time: {(current_time - self.game_time)//1000}s", True, WHITE)
+        time_text = self.font.render(f"Time: {int(self.sim_time)//1000}s", True, WHITE)
         quit_text = self.font.render("Press X to Quit", True, WHITE)  # <-- New quit hint
 
         self.screen.blit(score_text, (20, 20))
@@ -760,23 +1582,27 @@ class GameController:
             
     def return_to_homepage(self):
         """Return to the homepage, resetting necessary game states."""
+        self.reset_game()  # Fresh maze, players and timers; resources are kept
         self.state = "home"  # Set state to homepage
-        self.game_over = False  # Reset game over status
-        self.victory = False  # Reset victory status
-        # Optionally reset player and maze if needed
-        self.players[0].score = 0
-        self.players[0].lives = 5
-        self.players[0].pellets_collected = 0
-        self.maze = DynamicMaze()  # Create a new maze
-        self._init_positions()  # Reset player and ghost positions
-        self.set_new_destination()  # Set a new destination
-        self.last_shift_time = pygame.time.get_ticks()
-        self.popups = []
+    def _read_move(self):
+        """Map the WASD keys currently held to a grid direction."""
+        keys = pygame.key.get_pressed()
+        if keys[K_w]:
+            return (0, -1)
+        elif keys[K_s]:
+            return (0, 1)
+        elif keys[K_a]:
+            return (-1, 0)
+        elif keys[K_d]:
+            return (1, 0)
+        return None
+
     def run_game(self):
         running = True
         while running:
-            current_time = pygame.time.get_ticks()
-            dt = self.clock.tick(60)
+            # The simulation consumes real time in fixed ticks; rendering
+            # runs once per frame and may drop frames on a slow machine
+            frame_ms = self.clock.tick(60)
 
             # Handle events for all states
             for event in pygame.event.get():
@@ -789,9 +1615,6 @@ class GameController:
                             print("Start Game button clicked!")  # Debug
                             self.show_tutorial()
                             self.state = "game"
-                            self.game_time = pygame.time.get_ticks()
-                            self.last_shift_time = self.game_time
-                            self.last_move_time = self.game_time
                     if event.type == KEYDOWN:
                         if event.key == K_x:
                             pygame.quit()
@@ -799,73 +1622,21 @@ class GameController:
                 elif self.state == "game":
                     if event.type == KEYDOWN:
                         if self.game_over and event.key == K_r:
-                            self.__init__()
+                            self.reset_game()
                             self.state = "game"
-                            self.game_time = current_time
-                            self.last_shift_time = current_time
-                            self.last_move_time = current_time
                         elif event.key == K_x:
                             self.return_to_homepage()
 
-            # Handle continuous key presses for movement in game state
+            alpha = 1.0
             if self.state == "game" and not self.game_over:
-                keys = pygame.key.get_pressed()
-                player = self.players[0]
-                if player.tokens:
-                    current_tile = player.tokens[0]
-                    x, y = current_tile.grid_pos
-
-                    if current_time - self.last_move_time >= self.move_delay:
-                        moved = False
-                        if keys[K_w] and y > 0:
-                            new_tile = self.maze.tiles[x][y-1]
-                            if not new_tile.obstacle:
-                                player.tokens[0] = new_tile
-                                self._check_pellet_collision(new_tile)
-                                self._check_destination_reached(new_tile)
-                                moved = True
-                        elif keys[K_s] and y < self.maze.size-1:
-                            new_tile = self.maze.tiles[x][y+1]
-                            if not new_tile.obstacle:
-                                player.tokens[0] = new_tile
-                                self._check_pellet_collision(new_tile)
-                                self._check_destination_reached(new_tile)
-                                moved = True
-                        elif keys[K_a] and x > 0:
-                            new_tile = self.maze.tiles[x-1][y]
-                            if not new_tile.obstacle:
-                                player.tokens[0] = new_tile
-                                self._check_pellet_collision(new_tile)
-                                self._check_destination_reached(new_tile)
-                                moved = True
-                        elif keys[K_d] and x < self.maze.size-1:
-                            new_tile = self.maze.tiles[x+1][y]
-                            if not new_tile.obstacle:
-                                player.tokens[0] = new_tile
-                                self._check_pellet_collision(new_tile)
-                                self._check_destination_reached(new_tile)
-                                moved = True
-                        if moved:
-                            self.last_move_time = current_time
-
-            # Handle maze shifting
-            if self.state == "game" and current_time - self.last_shift_time > 15000:
-                self.maze.shift_tiles()
-                self.last_shift_time = current_time
-                if self.players[0].tokens:
-                    x, y = self.players[0].tokens[0].grid_pos
-                    self.players[0].tokens[0] = self.maze.tiles[x][y]
-                warning = PopUpText("Maze Shifted!", (400, 300), YELLOW, 60, 32)
-                self.popups.append(warning)
+                alpha = self.advance(frame_ms, self._read_move())
 
             # Render based on state
             self.screen.fill(BLACK)
             if self.state == "home":
                 self._draw_homepage()
             elif self.state == "game":
-                if not self.game_over:
-                    self._update_game(dt, current_time)
-                self._draw_interface(current_time)
+                self._draw_interface(alpha)
 
             pygame.display.flip()
 
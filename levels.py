@@ -0,0 +1,173 @@
+"""Level packs: many baked levels in one memory-mapped file.
+
+    python levels.py bake --count 200 --sizes 15,21,31 --out levels.pack
+    python levels.py list levels.pack --min-size 21
+    python levels.py play levels.pack --name level_0007_15
+
+A pack is a header, a fixed-size index entry per level (name, offset,
+length, size, pellet and obstacle counts), then the level files back to
+back. Opening a pack maps the file and views the index as a NumPy record
+array, so levels can be picked by size or pellet count without reading
+any tile data. A chosen level is then read in place with LevelFile.
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from game import DynamicMaze, GameController, LevelFile, encode_level
+
+PACK_MAGIC = b'HMPK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sHHI')  # magic, version, reserved, level count
+INDEX_DTYPE = np.dtype([('name', 'S32'), ('offset', '<u8'), ('length', '<u8'),
+                        ('size', '<u4'), ('pellets', '<u4'), ('obstacles', '<u4')])
+
+
+class LevelPack:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count = PACK_HEADER.unpack_from(self._map)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Not a level pack: {path}")
+        if version != PACK_VERSION:
+            raise ValueError(f"Unsupported level pack version: {version}")
+        self.index = np.frombuffer(self._map, dtype=INDEX_DTYPE, count=count, offset=PACK_HEADER.size)
+        self._positions = {name.decode(): i for i, name in enumerate(self.index['name'])}
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def names(self):
+        return list(self._positions)
+
+    def select(self, min_size=0, max_size=None, min_pellets=0):
+        """Names of the levels matching the filters, read from the index only."""
+        index = self.index
+        mask = (index['size'] >= min_size) & (index['pellets'] >= min_pellets)
+        if max_size is not None:
+            mask &= index['size'] <= max_size
+        return [name.decode() for name in index['name'][mask]]
+
+    def entry(self, name):
+        return self.index[self._positions[name]]
+
+    def open(self, name):
+        return LevelFile(self._map, int(self.entry(name)['offset']))
+
+    def load_maze(self, name):
+        return self.open(name).to_maze()
+
+    def maze_factory(self, names=None):
+        """A maze_factory for GameController that plays random levels from names."""
+        names = names or self.names
+        return lambda: self.load_maze(random.choice(names))
+
+
+def write_pack(path, levels):
+    """Write (name, level bytes) pairs to a pack file."""
+    levels = list(levels)
+    index = np.zeros(len(levels), dtype=INDEX_DTYPE)
+    offset = PACK_HEADER.size + index.nbytes
+    for entry, (name, data) in zip(index, levels):
+        level = LevelFile(data)
+        offset = (offset + 7) // 8 * 8  # Keep every level 8-byte aligned in the map
+        entry['name'] = name.encode()
+        entry['offset'], entry['length'], entry['size'] = offset, len(data), level.size
+        # Padding bits are zero, so whole-mask bit counts are tile counts
+        entry['pellets'] = np.unpackbits(level.pellet_bits).sum()
+        entry['obstacles'] = np.unpackbits(level.obstacle_bits).sum()
+        offset += len(data)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(levels)))
+        f.write(index.tobytes())
+        for entry, (_, data) in zip(index, levels):
+            f.write(b'\0' * (int(entry['offset']) - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)  # Readers never see a half-written pack
+
+
+def _reachable(obstacles, start):
+    """Tiles the player can walk to from start (W/A/S/D moves)."""
+    size = obstacles.shape[0]
+    seen = np.zeros_like(obstacles)
+    seen[start] = True
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if 0 <= nx < size and 0 <= ny < size and not seen[nx, ny] and not obstacles[nx, ny]:
+                seen[nx, ny] = True
+                queue.append((nx, ny))
+    return seen
+
+
+def bake_level(size, seed):
+    """Roll a maze with the game's random generator and fix its spawns and a
+    destination the first player can actually reach."""
+    np.random.seed(seed)
+    center = size // 2
+    spawns = [(1, 1), (size - 2, size - 2)]
+    ghost_spawns = [(center + 1, center + 1), (center - 1, center + 1), (center + 1, center - 1)]
+    while True:
+        obstacles, pellets = DynamicMaze.random_layout(size)
+        for x, y in ghost_spawns:
+            obstacles[x, y] = False
+        reachable = _reachable(obstacles, spawns[0])
+        reachable[spawns[0]] = False
+        candidates = np.argwhere(reachable)
+        if len(candidates):
+            destination = tuple(int(v) for v in candidates[np.random.randint(len(candidates))])
+            return encode_level(obstacles, pellets, spawns, ghost_spawns, destination)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake, list and play level packs.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bake = commands.add_parser('bake', help="generate random levels into a pack")
+    bake.add_argument('--count', type=int, default=100, help="levels to bake")
+    bake.add_argument('--sizes', default='15', help="comma-separated maze sizes to cycle through")
+    bake.add_argument('--seed', type=int, default=0, help="seed of the first level")
+    bake.add_argument('--out', default='levels.pack', help="pack path")
+    listing = commands.add_parser('list', help="list the levels in a pack")
+    listing.add_argument('pack')
+    listing.add_argument('--min-size', type=int, default=0)
+    listing.add_argument('--max-size', type=int, default=None)
+    listing.add_argument('--min-pellets', type=int, default=0)
+    play = commands.add_parser('play', help="play levels from a pack")
+    play.add_argument('pack')
+    play.add_argument('--name', action='append', help="level to play (repeatable; default: all)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'bake':
+        start = time.perf_counter()
+        sizes = [int(size) for size in args.sizes.split(',')]
+        levels = []
+        for i in range(args.count):
+            size = sizes[i % len(sizes)]
+            levels.append((f"level_{i:04d}_{size}", bake_level(size, args.seed + i)))
+        write_pack(args.out, levels)
+        print(f"{args.count} levels baked into {args.out} in {time.perf_counter() - start:.1f}s")
+    elif args.command == 'list':
+        pack = LevelPack(args.pack)
+        for name in pack.select(args.min_size, args.max_size, args.min_pellets):
+            entry = pack.entry(name)
+            print(f"{name}: size {entry['size']}, {entry['pellets']} pellets, "
+                  f"{entry['obstacles']} obstacles, {entry['length']} bytes")
+    else:
+        pack = LevelPack(args.pack)
+        GameController(maze_factory=pack.maze_factory(args.name)).run_game()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
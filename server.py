@@ -0,0 +1,432 @@
+"""Authoritative multiplayer server, thin client and load tester.
+
+    python server.py serve --port 7777
+    python server.py client --room lobby
+    python server.py loadtest --clients 200 --seconds 10
+
+The server owns one GameSimulation per room and advances every room at a
+fixed tick rate from a single asyncio loop. Clients only send the
+direction they are holding. Each tick the server sends a delta against
+the previous tick: the pellets that changed, the players and ghosts that
+moved, and the number of maze quarter turns. Clients replay the turns on
+their copy of the grid. A client that is new or fell behind gets a full
+keyframe. TCP keeps the stream ordered, so one delta per room is encoded
+and shared by all of its clients.
+
+Messages are length-prefixed: a 4-byte big-endian length, then a type
+byte and a struct-packed payload.
+"""
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+
+import numpy as np
+
+from game import GameSimulation, SIM_HZ
+from snapshot import GameSnapshot, TICK, ROTATION, DEST_X, DEST_Y, GAME_OVER, VICTORY
+
+LENGTH = struct.Struct('!I')
+JOIN, INPUT, WELCOME, KEYFRAME, DELTA, ERROR = b'J', b'I', b'W', b'K', b'D', b'E'
+
+INPUT_MOVE = struct.Struct('!bb')
+# The only directions a client may hold; anything else would let it jump
+# over walls, since the server applies the offset as sent
+VALID_MOVES = {(0, -1), (0, 1), (-1, 0), (1, 0)}
+KEYFRAME_HEADER = struct.Struct('!IHBhhBBB')  # tick, size, rotation, dest x/y, flags, players, ghosts
+DELTA_HEADER = struct.Struct('!IBB')  # tick, flags, quarter turns since the last tick
+PLAYER_RECORD = struct.Struct('!BHHBIHB')  # index, x, y, lives, score, invincible, has_token
+GHOST_RECORD = struct.Struct('!BHH')  # index, x, y
+COUNT = struct.Struct('!H')
+DESTINATION = struct.Struct('!hh')
+
+# Delta flags
+F_GAME_OVER, F_VICTORY, F_ROTATED, F_PELLETS, F_PLAYERS, F_GHOSTS, F_DESTINATION = (1 << i for i in range(7))
+
+MAX_WRITE_BUFFER = 256 * 1024  # Beyond this a client is skipped and resynced with a keyframe
+GAME_OVER_PAUSE = 3.0  # Seconds before a finished room starts a new game
+
+
+def frame(body):
+    return LENGTH.pack(len(body)) + body
+
+
+async def read_message(reader):
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+def _status_flags(snapshot):
+    return (F_GAME_OVER if snapshot.meta[GAME_OVER] else 0) | (F_VICTORY if snapshot.meta[VICTORY] else 0)
+
+
+def _pack_players(snapshot, indices):
+    return b''.join(PLAYER_RECORD.pack(i, *(int(v) for v in snapshot.players[i])) for i in indices)
+
+
+def _pack_ghosts(snapshot, indices):
+    return b''.join(GHOST_RECORD.pack(i, *(int(v) for v in snapshot.ghosts[i])) for i in indices)
+
+
+def encode_keyframe(snapshot):
+    meta = snapshot.meta
+    header = KEYFRAME_HEADER.pack(int(meta[TICK]), snapshot.size, int(meta[ROTATION]) % 4,
+                                  int(meta[DEST_X]), int(meta[DEST_Y]), _status_flags(snapshot),
+                                  len(snapshot.players), len(snapshot.ghosts))
+    return frame(KEYFRAME + header +
+                 np.packbits(snapshot.obstacles).tobytes() +
+                 np.packbits(snapshot.pellets).tobytes() +
+                 _pack_players(snapshot, range(len(snapshot.players))) +
+                 _pack_ghosts(snapshot, range(len(snapshot.ghosts))))
+
+
+def encode_delta(previous, current):
+    """Encode what changed between two consecutive snapshots."""
+    turns = int(current.meta[ROTATION] - previous.meta[ROTATION]) % 4
+    old_pellets = np.rot90(previous.pellets, turns) if turns else previous.pellets
+    pellets = np.flatnonzero(old_pellets != current.pellets)
+    players = np.flatnonzero((previous.players != current.players).any(axis=1))
+    ghosts = np.flatnonzero((previous.ghosts != current.ghosts).any(axis=1))
+    destination_moved = (previous.meta[DEST_X:DEST_Y + 1] != current.meta[DEST_X:DEST_Y + 1]).any()
+
+    flags = _status_flags(current)
+    body = []
+    if turns:
+        flags |= F_ROTATED
+    if len(pellets):
+        flags |= F_PELLETS
+        body += [COUNT.pack(len(pellets)), pellets.astype('>u4').tobytes()]
+    if len(players):
+        flags |= F_PLAYERS
+        body += [bytes([len(players)]), _pack_players(current, players)]
+    if len(ghosts):
+        flags |= F_GHOSTS
+        body += [bytes([len(ghosts)]), _pack_ghosts(current, ghosts)]
+    if destination_moved:
+        flags |= F_DESTINATION
+        body.append(DESTINATION.pack(int(current.meta[DEST_X]), int(current.meta[DEST_Y])))
+    return frame(DELTA + DELTA_HEADER.pack(int(current.meta[TICK]), flags, turns) + b''.join(body))
+
+
+def _unpack_records(record, snapshot_rows, data, offset, count):
+    for _ in range(count):
+        index, *values = record.unpack_from(data, offset)
+        snapshot_rows[index] = values
+        offset += record.size
+    return offset
+
+
+def apply_message(snapshot, body):
+    """Apply a keyframe or delta to the client's snapshot and return it."""
+    kind, data = body[:1], body[1:]
+    if kind == KEYFRAME:
+        tick, size, rotation, dest_x, dest_y, flags, n_players, n_ghosts = KEYFRAME_HEADER.unpack_from(data)
+        snapshot = GameSnapshot(size, n_players, n_ghosts)
+        offset = KEYFRAME_HEADER.size
+        mask_bytes = (size * size + 7) // 8
+        for grid in (snapshot.obstacles, snapshot.pellets):
+            bits = np.frombuffer(data, np.uint8, mask_bytes, offset)
+            grid[:] = np.unpackbits(bits, count=size * size).reshape(size, size)
+            offset += mask_bytes
+        offset = _unpack_records(PLAYER_RECORD, snapshot.players, data, offset, n_players)
+        _unpack_records(GHOST_RECORD, snapshot.ghosts, data, offset, n_ghosts)
+        snapshot.meta[:] = (tick, rotation, dest_x, dest_y, flags & F_GAME_OVER, flags & F_VICTORY)
+    elif kind == DELTA and snapshot is not None:
+        tick, flags, turns = DELTA_HEADER.unpack_from(data)
+        offset = DELTA_HEADER.size
+        if flags & F_ROTATED:
+            snapshot.obstacles[:] = np.rot90(snapshot.obstacles, turns).copy()
+            snapshot.pellets[:] = np.rot90(snapshot.pellets, turns).copy()
+        if flags & F_PELLETS:
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            snapshot.pellets.reshape(-1)[np.frombuffer(data, '>u4', count, offset)] ^= 1
+            offset += 4 * count
+        if flags & F_PLAYERS:
+            offset = _unpack_records(PLAYER_RECORD, snapshot.players, data, offset + 1, data[offset])
+        if flags & F_GHOSTS:
+            offset = _unpack_records(GHOST_RECORD, snapshot.ghosts, data, offset + 1, data[offset])
+        if flags & F_DESTINATION:
+            snapshot.meta[DEST_X], snapshot.meta[DEST_Y] = DESTINATION.unpack_from(data, offset)
+        snapshot.meta[TICK] = tick
+        snapshot.meta[ROTATION] = (snapshot.meta[ROTATION] + turns) % 4
+        snapshot.meta[GAME_OVER] = bool(flags & F_GAME_OVER)
+        snapshot.meta[VICTORY] = bool(flags & F_VICTORY)
+    return snapshot
+
+
+# =====================
+# Server
+# =====================
+
+class ClientConnection:
+    def __init__(self, writer):
+        self.writer = writer
+        self.player_index = None
+        self.move = None
+        self.needs_keyframe = True
+
+    def send(self, data):
+        self.writer.write(data)
+
+
+class Room:
+    """One game, advanced by the server's tick loop."""
+    def __init__(self, name, ghost_types, maze_size, tick_rate):
+        self.name = name
+        self.sim = GameSimulation(ghost_types, maze_size)
+        self.frame_ms = 1000 / tick_rate
+        self.pause_ticks = int(GAME_OVER_PAUSE * tick_rate)
+        self.clients = [None] * len(self.sim.players)  # One slot per player
+        self.sim.set_active(0, False)  # Slots become active as clients join
+        self.previous = GameSnapshot.for_sim(self.sim)
+        self.current = GameSnapshot.for_sim(self.sim)
+        self.previous.capture(self.sim)
+        self.over_ticks = 0
+
+    def join(self, client):
+        for index, slot in enumerate(self.clients):
+            if slot is None:
+                self.clients[index] = client
+                client.player_index = index
+                self.sim.set_active(index, True)
+                return True
+        return False
+
+    def leave(self, client):
+        if self.clients[client.player_index] is client:
+            self.clients[client.player_index] = None
+            self.sim.set_active(client.player_index, False)
+
+    def is_empty(self):
+        return all(client is None for client in self.clients)
+
+    def tick(self):
+        sim = self.sim
+        if sim.game_over:
+            self.over_ticks += 1
+            if self.over_ticks >= self.pause_ticks:
+                # New maze: every client needs the full state again
+                sim.reset_game()
+                self.over_ticks = 0
+                for client in self.clients:
+                    if client:
+                        client.needs_keyframe = True
+        else:
+            sim.advance(self.frame_ms, moves=[client.move if client else None for client in self.clients])
+
+        self.current.capture(sim)
+        delta = encode_delta(self.previous, self.current)
+        keyframe = None
+        sent = messages = 0
+        for client in self.clients:
+            if client is None:
+                continue
+            if client.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                client.needs_keyframe = True  # Too far behind for deltas; resync later
+                continue
+            if client.needs_keyframe:
+                keyframe = keyframe or encode_keyframe(self.current)
+                client.send(keyframe)
+                client.needs_keyframe = False
+                sent += len(keyframe)
+            else:
+                client.send(delta)
+                sent += len(delta)
+            messages += 1
+        self.previous, self.current = self.current, self.previous
+        return sent, messages
+
+
+class GameServer:
+    def __init__(self, host='127.0.0.1', port=7777, tick_rate=20, ghost_types=('minimax', 'a_star', 'tabular_rl'),
+                 maze_size=15):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.ghost_types = ghost_types
+        self.maze_size = maze_size
+        self.rooms = {}
+
+    async def handle_client(self, reader, writer):
+        client = ClientConnection(writer)
+        room = None
+        try:
+            body = await read_message(reader)
+            if body[:1] != JOIN:
+                return
+            name = body[1:].decode() or 'lobby'
+            room = self.rooms.get(name)
+            if room is None:
+                room = self.rooms[name] = Room(name, self.ghost_types, self.maze_size, self.tick_rate)
+            if not room.join(client):
+                writer.write(frame(ERROR + b'room is full'))
+                room = None
+                return
+            writer.write(frame(WELCOME + bytes([client.player_index])))
+
+            while True:
+                body = await read_message(reader)
+                if body[:1] == INPUT:
+                    move = INPUT_MOVE.unpack_from(body, 1)
+                    if move == (0, 0):
+                        client.move = None
+                    elif move in VALID_MOVES:
+                        client.move = move
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (struct.error, UnicodeDecodeError):
+            writer.write(frame(ERROR + b'malformed message'))
+        finally:
+            if room is not None:
+                room.leave(client)
+                if room.is_empty():
+                    self.rooms.pop(room.name, None)
+            writer.close()
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        ticks, sent, messages, report_at = 0, 0, 0, loop.time() + 5
+        while True:
+            for room in list(self.rooms.values()):
+                room_sent, room_messages = room.tick()
+                sent += room_sent
+                messages += room_messages
+            ticks += 1
+
+            now = loop.time()
+            if now >= report_at:
+                clients = sum(len([c for c in room.clients if c]) for room in self.rooms.values())
+                print(f"{ticks / 5:.1f} ticks/s, {len(self.rooms)} rooms, {clients} clients, "
+                      f"{sent / max(messages, 1):.1f} bytes per client per tick")
+                ticks, sent, messages, report_at = 0, 0, 0, now + 5
+
+            next_tick += interval
+            if next_tick < now:
+                next_tick = now  # Overloaded: don't try to catch up with a burst of ticks
+            await asyncio.sleep(next_tick - now)
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"Serving on {self.host}:{self.port} at {self.tick_rate} ticks/s")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.tick_loop())
+
+
+# =====================
+# Clients
+# =====================
+
+async def _join(host, port, room):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(frame(JOIN + room.encode()))
+    body = await read_message(reader)
+    if body[:1] != WELCOME:
+        raise ConnectionError(body[1:].decode())
+    return reader, writer, body[1]
+
+
+async def run_client(host, port, room):
+    """Thin pygame client: sends held keys and draws whatever the server sends."""
+    import pygame
+    from pygame.locals import QUIT, K_w, K_s, K_a, K_d
+    from game import make_ghost_images
+    from snapshot import draw_snapshot
+
+    reader, writer, player_index = await _join(host, port, room)
+    screen = pygame.display.set_mode((1000, 800))
+    pygame.display.set_caption(f"Hex Maze Chase - {room} (player {player_index + 1})")
+    ghost_images = make_ghost_images()
+    state = {'snapshot': None}
+
+    async def receive():
+        while True:
+            state['snapshot'] = apply_message(state['snapshot'], await read_message(reader))
+
+    receiver = asyncio.ensure_future(receive())
+    held = (0, 0)
+    try:
+        while not receiver.done():
+            if any(event.type == QUIT for event in pygame.event.get()):
+                break
+            keys = pygame.key.get_pressed()
+            move = ((0, -1) if keys[K_w] else (0, 1) if keys[K_s] else
+                    (-1, 0) if keys[K_a] else (1, 0) if keys[K_d] else (0, 0))
+            if move != held:
+                writer.write(frame(INPUT + INPUT_MOVE.pack(*move)))
+                held = move
+            if state['snapshot'] is not None:
+                draw_snapshot(screen, state['snapshot'], ghost_images)
+                pygame.display.flip()
+            await asyncio.sleep(1 / 60)
+    finally:
+        receiver.cancel()
+        writer.close()
+        pygame.quit()
+
+
+async def run_loadtest(host, port, clients, seconds):
+    """Connect many scripted clients over localhost and report what they receive."""
+    moves = [(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)]
+    stats = []
+
+    async def bot(index):
+        reader, writer, _ = await _join(host, port, f"load-{index // 2}")
+        received = {'messages': 0, 'bytes': 0}
+        stats.append(received)
+        snapshot = None
+        deadline = time.perf_counter() + seconds
+        next_input = 0
+        while time.perf_counter() < deadline:
+            try:
+                body = await asyncio.wait_for(read_message(reader), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            snapshot = apply_message(snapshot, body)
+            received['messages'] += 1
+            received['bytes'] += LENGTH.size + len(body)
+            if time.perf_counter() >= next_input:
+                writer.write(frame(INPUT + INPUT_MOVE.pack(*random.choice(moves))))
+                next_input = time.perf_counter() + 0.25
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bot(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    messages = [s['messages'] / elapsed for s in stats]
+    sent = [s['bytes'] / elapsed for s in stats]
+    print(f"{clients} clients for {elapsed:.1f}s: "
+          f"{np.mean(messages):.1f} ticks/s per client (min {np.min(messages):.1f}), "
+          f"{np.mean(sent):.0f} bytes/s per client, "
+          f"{np.sum(sent) / 1024:.1f} KiB/s total")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hex Maze Chase network play.")
+    parser.add_argument('mode', choices=['serve', 'client', 'loadtest'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--tick-rate', type=int, default=20, help=f"server ticks per second (max {SIM_HZ})")
+    parser.add_argument('--ghosts', default='minimax,a_star,tabular_rl', help="ghost AI types per room")
+    parser.add_argument('--size', type=int, default=15, help="maze size")
+    parser.add_argument('--room', default='lobby', help="room to join (client)")
+    parser.add_argument('--clients', type=int, default=100, help="connections to open (loadtest)")
+    parser.add_argument('--seconds', type=float, default=10, help="loadtest duration")
+    args = parser.parse_args(argv)
+
+    if args.mode == 'serve':
+        server = GameServer(args.host, args.port, min(args.tick_rate, SIM_HZ),
+                            tuple(args.ghosts.split(',')), args.size)
+        asyncio.run(server.serve())
+    elif args.mode == 'client':
+        asyncio.run(run_client(args.host, args.port, args.room))
+    else:
+        asyncio.run(run_loadtest(args.host, args.port, args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Split mode: simulation and rendering in separate processes.
+
+    python shared_state.py
+
+The simulation process steps GameSimulation at SIM_HZ and publishes every
+tick into one of two GameSnapshot buffers in multiprocessing.shared_memory.
+The renderer process draws the front buffer straight from those arrays,
+without pickling or copying. A slow AI decision then cannot drop frames,
+and a slow frame cannot slow the simulation.
+
+Each buffer has a sequence counter, which the writer makes odd while it
+writes. The writer only ever fills the back buffer and flips `front`
+when done. The reader draws the front buffer, then checks its counter.
+If the writer lapped it mid-draw, the torn frame is not shown.
+Player input travels the other way as a single int32 direction code, so
+it can never be read half-written.
+"""
+import multiprocessing
+import sys
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pygame
+from pygame.locals import QUIT, KEYDOWN, K_w, K_s, K_a, K_d, K_r, K_x
+
+from game import GameSimulation, SIM_STEP_MS, make_ghost_images
+from snapshot import GameSnapshot, draw_snapshot
+
+# Header (int64): sequence of buffer 0, sequence of buffer 1, front buffer index
+FRONT = 2
+HEADER_BYTES = 32
+# Control block (int32): held direction code, restart request, quit request
+MOVE, RESTART, QUIT_REQUEST = range(3)
+CONTROL_BYTES = 16
+MOVES = [None, (0, -1), (0, 1), (-1, 0), (1, 0)]  # Direction codes: none, W, S, A, D
+
+
+class SharedGameState:
+    """Two GameSnapshot buffers and a control block in one shared memory block."""
+    def __init__(self, size, n_players, n_ghosts, name=None):
+        snapshot_bytes = GameSnapshot.nbytes(size, n_players, n_ghosts)
+        if name is None:
+            self.shm = SharedMemory(create=True, size=HEADER_BYTES + CONTROL_BYTES + 2 * snapshot_bytes)
+        else:
+            self.shm = SharedMemory(name=name)
+        buf = self.shm.buf
+        self.header = np.ndarray(3, dtype=np.int64, buffer=buf)
+        self.control = np.ndarray(3, dtype=np.int32, buffer=buf, offset=HEADER_BYTES)
+        self.buffers = [GameSnapshot(size, n_players, n_ghosts, buf,
+                                     HEADER_BYTES + CONTROL_BYTES + i * snapshot_bytes)
+                        for i in range(2)]
+
+    def publish(self, sim):
+        """Write the simulation into the back buffer, then make it the front."""
+        back = 1 - int(self.header[FRONT])
+        self.header[back] += 1  # Odd: write in progress
+        self.buffers[back].capture(sim)
+        self.header[back] += 1
+        self.header[FRONT] = back
+
+    def read(self):
+        """Return (snapshot, front, sequence); the snapshot is a live view."""
+        front = int(self.header[FRONT])
+        return self.buffers[front], front, int(self.header[front])
+
+    def unchanged(self, front, sequence):
+        return self.header[front] == sequence
+
+    def close(self):
+        # The NumPy views must go before the buffer can be released
+        del self.header, self.control, self.buffers
+        self.shm.close()
+
+
+def run_simulation(shm_name, size, n_players, ghost_types):
+    """Simulation process: advance in real time and publish every tick."""
+    shared = SharedGameState(size, n_players, len(ghost_types), name=shm_name)
+    sim = GameSimulation(ghost_types, size)
+    shared.publish(sim)
+    control = shared.control
+    last = time.perf_counter()
+    while not control[QUIT_REQUEST]:
+        now = time.perf_counter()
+        if control[RESTART]:
+            control[RESTART] = 0
+            if sim.game_over:
+                sim.reset_game()
+                shared.publish(sim)
+        ticks = sim.ticks
+        sim.advance((now - last) * 1000, MOVES[control[MOVE]])
+        last = now
+        if sim.ticks != ticks:
+            shared.publish(sim)
+        time.sleep(max(0.0, SIM_STEP_MS / 1000 - (time.perf_counter() - now)))
+    shared.close()
+
+
+def run_split(ghost_types=('minimax', 'a_star', 'rl'), size=15):
+    """Renderer process: draw published snapshots and forward input."""
+    screen = pygame.display.set_mode((1000, 800))
+    pygame.display.set_caption("Hex Maze Chase")
+    clock = pygame.time.Clock()
+    ghost_images = make_ghost_images()
+
+    n_players = 2
+    shared = SharedGameState(size, n_players, len(ghost_types))
+    # Spawned, so the simulation does not inherit the display connection
+    simulation = multiprocessing.get_context('spawn').Process(
+        target=run_simulation, args=(shared.shm.name, size, n_players, ghost_types), daemon=True)
+    simulation.start()
+
+    try:
+        running = True
+        while running and simulation.is_alive():
+            for event in pygame.event.get():
+                if event.type == QUIT or (event.type == KEYDOWN and event.key == K_x):
+                    running = False
+                elif event.type == KEYDOWN and event.key == K_r:
+                    shared.control[RESTART] = 1
+
+            keys = pygame.key.get_pressed()
+            shared.control[MOVE] = (1 if keys[K_w] else 2 if keys[K_s] else
+                                    3 if keys[K_a] else 4 if keys[K_d] else 0)
+
+            snapshot, front, sequence = shared.read()
+            if sequence > 0 and sequence % 2 == 0:
+                draw_snapshot(screen, snapshot, ghost_images)
+                if shared.unchanged(front, sequence):
+                    pygame.display.flip()  # Torn frames are never shown
+            clock.tick(60)
+    finally:
+        shared.control[QUIT_REQUEST] = 1
+        simulation.join(timeout=2)
+        shared.close()
+        shared.shm.unlink()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(run_split())
@@ -0,0 +1,129 @@
+"""Plain-array game state for drawing frames away from the simulation.
+
+A GameSnapshot holds everything a renderer needs as small NumPy arrays:
+the maze and pellets as (size, size) grids indexed [x][y] like
+DynamicMaze.tiles, one row per player and per ghost, and a few scalars.
+The network server diffs snapshots between ticks, thin clients draw them
+with draw_snapshot(), and split mode lays them out in shared memory.
+"""
+import numpy as np
+import pygame
+
+from game import (BLACK, WHITE, RED, GREEN, PURPLE, BOARD_OFFSET, get_font, scale_ghost_images,
+                  tile_size_for)
+
+# Player rows: x, y, lives, score, invincible, has_token
+PLAYER_FIELDS = 6
+# Meta fields
+TICK, ROTATION, DEST_X, DEST_Y, GAME_OVER, VICTORY = range(6)
+META_FIELDS = 6
+NO_DESTINATION = -1
+
+
+def _aligned(nbytes):
+    return (nbytes + 7) // 8 * 8
+
+
+class GameSnapshot:
+    def __init__(self, size, n_players=2, n_ghosts=3, buffer=None, offset=0):
+        """Allocate the arrays, or map them onto buffer starting at offset."""
+        self.size = size
+        for name, shape, dtype in self._layout(size, n_players, n_ghosts):
+            if buffer is None:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+                offset += _aligned(array.nbytes)
+            setattr(self, name, array)
+
+    @staticmethod
+    def _layout(size, n_players, n_ghosts):
+        return [
+            ('obstacles', (size, size), np.uint8),
+            ('pellets', (size, size), np.uint8),
+            ('players', (n_players, PLAYER_FIELDS), np.int32),
+            ('ghosts', (n_ghosts, 2), np.int32),
+            ('meta', (META_FIELDS,), np.int32),
+        ]
+
+    @classmethod
+    def nbytes(cls, size, n_players=2, n_ghosts=3):
+        """Buffer space needed by a snapshot of this shape."""
+        return sum(_aligned(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                   for _, shape, dtype in cls._layout(size, n_players, n_ghosts))
+
+    @classmethod
+    def for_sim(cls, sim):
+        return cls(sim.maze.size, len(sim.players), len(sim.ghosts))
+
+    def capture(self, sim):
+        """Copy the simulation's current state into the arrays."""
+        tiles = sim.maze.tiles
+        self.obstacles[:] = [[tile.obstacle for tile in row] for row in tiles]
+        self.pellets[:] = [[tile.pellets for tile in row] for row in tiles]
+        for row, player in zip(self.players, sim.players):
+            x, y = player.tokens[0].grid_pos if player.tokens else (0, 0)
+            row[:] = (x, y, player.lives, player.score, player.invincible, bool(player.tokens))
+        self.ghosts[:] = [ghost.position for ghost in sim.ghosts]
+        dest_x, dest_y = sim.destination or (NO_DESTINATION, NO_DESTINATION)
+        self.meta[:] = (sim.ticks, sim.maze.rotation % 4, dest_x, dest_y, sim.game_over, sim.victory)
+
+    def copy_from(self, other):
+        self.obstacles[:] = other.obstacles
+        self.pellets[:] = other.pellets
+        self.players[:] = other.players
+        self.ghosts[:] = other.ghosts
+        self.meta[:] = other.meta
+
+    @property
+    def destination(self):
+        if self.meta[DEST_X] == NO_DESTINATION:
+            return None
+        return (int(self.meta[DEST_X]), int(self.meta[DEST_Y]))
+
+
+def draw_snapshot(screen, snapshot, ghost_images, player_colors=(RED, (0, 0, 255))):
+    """Draw a snapshot with the same layout and colors as GameController."""
+    tile_size = tile_size_for(snapshot.size)
+    half = tile_size // 2
+    offset_x, offset_y = BOARD_OFFSET
+    font = get_font(24)
+    screen.fill(BLACK)
+
+    destination = snapshot.destination
+    for x in range(snapshot.size):
+        for y in range(snapshot.size):
+            px, py = x * tile_size + offset_x, y * tile_size + offset_y
+            if snapshot.obstacles[x, y]:
+                color = (20, 20, 30)
+            else:
+                color = (min(80, 30 + x * 2), min(80, 30 + y * 2), 50)
+            pygame.draw.rect(screen, color, (px, py, tile_size-2, tile_size-2))
+            if snapshot.pellets[x, y]:
+                pygame.draw.circle(screen, (255, 255, 100), (px + half, py + half), max(1, tile_size // 8))
+            if (x, y) == destination:
+                dest_size = tile_size // 2
+                pygame.draw.rect(screen, PURPLE, (px + (tile_size - dest_size)//2,
+                                                  py + (tile_size - dest_size)//2,
+                                                  dest_size, dest_size))
+
+    for i, (x, y, lives, score, invincible, has_token) in enumerate(snapshot.players):
+        if has_token and lives > 0 and (invincible <= 0 or (invincible // 10) % 2 == 0):
+            center = (x * tile_size + offset_x + half, y * tile_size + offset_y + half)
+            pygame.draw.circle(screen, player_colors[i % len(player_colors)], center, tile_size * 3 // 8)
+        hud = font.render(f"P{i + 1}  Score: {score}  Lives: {lives}", True, WHITE)
+        screen.blit(hud, (20, 20 + i * 30))
+
+    ghost_images = scale_ghost_images(ghost_images, tile_size)
+    for i, (x, y) in enumerate(snapshot.ghosts):
+        image = ghost_images[i % len(ghost_images)]
+        screen.blit(image, image.get_rect(center=(x * tile_size + offset_x + half,
+                                                  y * tile_size + offset_y + half)))
+
+    if snapshot.meta[GAME_OVER]:
+        message = "You Win!" if snapshot.meta[VICTORY] else "Game Over!"
+        text = get_font(40, bold=True).render(message, True, GREEN if snapshot.meta[VICTORY] else RED)
+        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        screen.blit(overlay, (0, 0))
+        screen.blit(text, (screen.get_width()//2 - text.get_width()//2, 300))
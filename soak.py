@@ -0,0 +1,152 @@
+"""Long-running soak test for memory and latency drift.
+
+    python soak.py --hours 4 --ghosts minimax,a_star --sample-minutes 10
+
+Plays hours of simulated time headlessly with the ScriptedPlayer bot,
+starting a new game whenever one ends or runs past a time limit (the
+bot can get walled in where no ghost reaches it). After a warm-up
+period it takes a baseline, then every sample interval it compares
+against that baseline:
+
+- traced memory (tracemalloc), and the allocation sites that grew most
+- live objects tracked by the garbage collector
+- p99 wall-clock latency of GameSimulation.step over the interval
+
+The run fails (exit status 1) as soon as memory or object growth passes
+its threshold, or the p99 stays above its threshold for several samples
+in a row (a single slow interval is usually just a busy machine). Leaks
+that take an hour to show up then fail in CI instead.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from game import GameSimulation, ScriptedPlayer, SIM_HZ
+
+
+def _sample(latencies):
+    p99_ms = float(np.percentile(latencies, 99)) * 1000 if latencies else 0.0
+    latencies.clear()  # Before the snapshot, so the samples themselves are not counted
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    return {
+        'snapshot': snapshot,
+        'memory': sum(stat.size for stat in snapshot.statistics('filename')),
+        'objects': len(gc.get_objects()),
+        'p99_ms': p99_ms,
+    }
+
+
+def run_soak(hours, ghost_types=('minimax', 'a_star'), maze_size=15, sample_minutes=10,
+             warmup_minutes=5, max_memory_growth=1.0, max_object_growth=0.5,
+             max_latency_ratio=2.0, latency_samples=3, pellet_quota=5, max_game_minutes=5,
+             report=print):
+    """Soak the simulation; returns a list of failure messages (empty on success).
+
+    Growth thresholds are fractions of the baseline (1.0 = doubled), the
+    latency threshold is a ratio of the baseline p99 that must be exceeded
+    in latency_samples consecutive samples.
+    """
+    tracemalloc.start(10)
+    sim = GameSimulation(ghost_types, maze_size)
+    bot = ScriptedPlayer(pellet_quota=pellet_quota)
+    player = sim.players[0]
+    sample_ticks = max(1, int(sample_minutes * 60 * SIM_HZ))
+    warmup_ticks = int(warmup_minutes * 60 * SIM_HZ)
+    total_ticks = warmup_ticks + int(hours * 3600 * SIM_HZ)
+
+    baseline = None
+    latencies = []
+    games = 0
+    slow_samples = 0
+    failures = []
+    try:
+        for tick in range(1, total_ticks + 1):
+            if sim.game_over or sim.sim_time >= max_game_minutes * 60000:
+                games += 1
+                sim.reset_game()
+                player = sim.players[0]
+            move = None
+            if sim.sim_time - player.last_move_time >= sim.move_delay:
+                move = bot.decide_move(sim)
+            start = time.perf_counter()
+            sim.step(move)
+            latencies.append(time.perf_counter() - start)
+
+            if tick == warmup_ticks or (tick > warmup_ticks and (tick - warmup_ticks) % sample_ticks == 0):
+                sample = _sample(latencies)
+                if baseline is None:
+                    baseline = sample
+                    report(f"baseline: {sample['memory'] / 1024:.0f} KiB traced, "
+                           f"{sample['objects']} objects, p99 step {sample['p99_ms']:.2f} ms")
+                    continue
+                failures = _check(baseline, sample, max_memory_growth, max_object_growth)
+                slow_samples = slow_samples + 1 if sample['p99_ms'] > baseline['p99_ms'] * max_latency_ratio else 0
+                if slow_samples >= latency_samples:
+                    failures.append(f"p99 step latency above {max_latency_ratio:.1f}x the baseline "
+                                    f"({baseline['p99_ms']:.2f} ms) for {slow_samples} samples, "
+                                    f"now {sample['p99_ms']:.2f} ms")
+                hours_done = (tick - warmup_ticks) / SIM_HZ / 3600
+                report(f"{hours_done:6.2f}h: {sample['memory'] / 1024:.0f} KiB traced, "
+                       f"{sample['objects']} objects, p99 step {sample['p99_ms']:.2f} ms, "
+                       f"{games} games")
+                if failures:
+                    for stat in sample['snapshot'].compare_to(baseline['snapshot'], 'lineno')[:10]:
+                        report(f"  {stat}")
+                    break
+    finally:
+        tracemalloc.stop()
+    return failures
+
+
+def _check(baseline, sample, max_memory_growth, max_object_growth):
+    failures = []
+    memory_growth = sample['memory'] / baseline['memory'] - 1
+    if memory_growth > max_memory_growth:
+        failures.append(f"traced memory grew {memory_growth:.0%} (limit {max_memory_growth:.0%})")
+    object_growth = sample['objects'] / baseline['objects'] - 1
+    if object_growth > max_object_growth:
+        failures.append(f"object count grew {object_growth:.0%} (limit {max_object_growth:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the game with the scripted bot and watch for drift.")
+    parser.add_argument('--hours', type=float, default=1, help="simulated hours to play after warm-up")
+    parser.add_argument('--ghosts', default='minimax,a_star', help="ghost AI types")
+    parser.add_argument('--size', type=int, default=15, help="maze size")
+    parser.add_argument('--sample-minutes', type=float, default=10, help="simulated minutes between samples")
+    parser.add_argument('--warmup-minutes', type=float, default=5, help="simulated minutes before the baseline")
+    parser.add_argument('--max-memory-growth', type=float, default=1.0,
+                        help="allowed traced memory growth over the baseline (1.0 = doubled)")
+    parser.add_argument('--max-object-growth', type=float, default=0.5,
+                        help="allowed growth in live objects over the baseline")
+    parser.add_argument('--max-latency-ratio', type=float, default=2.0,
+                        help="allowed p99 step latency as a multiple of the baseline")
+    parser.add_argument('--latency-samples', type=int, default=3,
+                        help="consecutive slow samples before the latency check fails")
+    parser.add_argument('--max-game-minutes', type=float, default=5,
+                        help="simulated minutes before an unfinished game is restarted")
+    parser.add_argument('--pellets', type=int, default=5, help="pellets the bot collects before heading home")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    failures = run_soak(args.hours, tuple(args.ghosts.split(',')), args.size, args.sample_minutes,
+                        args.warmup_minutes, args.max_memory_growth, args.max_object_growth,
+                        args.max_latency_ratio, args.latency_samples, args.pellets,
+                        args.max_game_minutes)
+    print(f"finished in {time.perf_counter() - start:.0f}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
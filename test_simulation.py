@@ -0,0 +1,57 @@
+"""Frame-rate independence of GameSimulation.advance."""
+import random
+from itertools import cycle
+
+import numpy as np
+
+from game import GameSimulation, MAX_SIM_STEPS_PER_FRAME, SIM_STEP_MS
+
+# Half a tick past 20 s, so float rounding cannot change the tick count
+PLAY_MS = 20000 + SIM_STEP_MS / 2
+
+
+def _play(frame_lengths, move=(1, 0)):
+    random.seed(7)
+    np.random.seed(7)
+    sim = GameSimulation(('minimax', 'a_star'))
+    elapsed = 0.0
+    for frame_ms in cycle(frame_lengths):
+        frame_ms = min(frame_ms, PLAY_MS - elapsed)
+        sim.advance(frame_ms, move)
+        elapsed += frame_ms
+        if elapsed >= PLAY_MS:
+            return sim
+
+
+def _state(sim):
+    player = sim.players[0]
+    return {
+        'ticks': sim.ticks,
+        'player': player.tokens[0].grid_pos,
+        'lives': player.lives,
+        'score': player.score,
+        'ghosts': [ghost.position for ghost in sim.ghosts],
+        'rotation': sim.maze.rotation,
+        'pellets': sim.maze.count_pellets(),
+        'game_over': sim.game_over,
+    }
+
+
+def test_same_state_for_any_frame_lengths():
+    steady = _state(_play([16]))
+    assert steady['ticks'] == 1200
+    assert _state(_play([5, 40, 7, 33])) == steady
+    assert _state(_play([SIM_STEP_MS])) == steady
+
+
+def test_long_frames_slow_the_simulation_down():
+    random.seed(7)
+    np.random.seed(7)
+    sim = GameSimulation(('minimax', 'a_star'))
+    long_frame = (MAX_SIM_STEPS_PER_FRAME + 3) * SIM_STEP_MS
+    for _ in range(10):
+        sim.advance(long_frame)
+    # Capped ticks run in full; the surplus is dropped, not carried over
+    assert sim.ticks == 10 * MAX_SIM_STEPS_PER_FRAME
+    assert sim.sim_time == sim.ticks * SIM_STEP_MS
+    assert sim.accumulator < SIM_STEP_MS
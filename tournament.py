@@ -0,0 +1,201 @@
+"""Headless tournament for comparing ghost AI configurations.
+
+Each configuration is a comma-separated list of ghost specs, e.g.
+
+    python tournament.py --config minimax:1,a_star --config mcts:0.02,rl:weights.h5 \
+        --matches 1000 --sizes 11,15 --out report.csv
+
+Ghost specs: minimax[:depth], a_star, rl[:weights_path],
+tabular_rl:table_path, mcts[:time_budget]. Every match pits the
+ScriptedPlayer bot against the configured ghosts on a seeded DynamicMaze,
+and matches are spread across all cores with a process pool. The bot
+collects --pellets pellets before heading for the destination, so it has
+to cross the maze and the ghosts get a chance to catch it; the quota is
+recorded in the report. AIs are reset before each match and tabular
+tables are only read, with exploration off, so a match depends on its
+seed alone, not on the matches its worker played before.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game import (GameSimulation, Ghost, DynamicMaze, ScriptedPlayer, MinimaxAI,
+                  AStarPathfinder, QLearningAI, TabularQLearningAI, MCTSGhostAI)
+
+
+def build_ai(spec):
+    """Create the AI described by a ghost spec such as 'minimax:3'."""
+    ai_type, _, arg = spec.partition(':')
+    if ai_type == 'minimax':
+        return MinimaxAI(depth=int(arg or 1))
+    elif ai_type == 'a_star':
+        return AStarPathfinder()
+    elif ai_type == 'rl':
+        return QLearningAI(weights_path=arg or None)
+    elif ai_type == 'tabular_rl':
+        if not arg:
+            raise ValueError(f"{spec} needs a trained table, e.g. tabular_rl:q_table.npy")
+        return TabularQLearningAI(table_path=arg, epsilon=0, learn=False)
+    elif ai_type == 'mcts':
+        # One search process per match; the tournament already fills every core
+        return MCTSGhostAI(workers=1, time_budget=float(arg or 0.02))
+    raise ValueError(f"Unknown ghost spec: {spec}")
+
+
+class TimedAI:
+    """Wraps an AI and records how long each decision takes."""
+    def __init__(self, ai):
+        self.ai = ai
+        self.latencies = []
+
+    def decide_move(self, game_state, current_pos):
+        start = time.perf_counter()
+        move = self.ai.decide_move(game_state, current_pos)
+        self.latencies.append(time.perf_counter() - start)
+        return move
+
+    def reset(self):
+        if hasattr(self.ai, 'reset'):
+            self.ai.reset()
+
+
+# AIs built in this worker process, reused across matches (the RL model is slow to build)
+_WORKER_AIS = {}
+
+
+def play_match(config, maze_size, seed, max_seconds, pellet_quota=5):
+    """Play one headless match and return its raw results."""
+    random.seed(seed)
+    np.random.seed(seed)
+    specs = config.split(',')
+    if config not in _WORKER_AIS:
+        _WORKER_AIS[config] = [TimedAI(build_ai(spec)) for spec in specs]
+    timed_ais = _WORKER_AIS[config]
+    for timed in timed_ais:
+        timed.latencies = []
+
+    ghosts = [Ghost(spec.partition(':')[0], i, ai=timed) for i, (spec, timed) in enumerate(zip(specs, timed_ais))]
+    sim = GameSimulation(maze_size=maze_size, ghosts=ghosts)  # Resets the AIs
+    sim.reset_game(DynamicMaze(maze_size))
+    bot = ScriptedPlayer(pellet_quota=pellet_quota)
+    player = sim.players[0]
+
+    first_catch = None
+    catches = 0
+    max_ms = max_seconds * 1000
+    while not sim.game_over and sim.sim_time < max_ms:
+        move = None
+        if sim.sim_time - player.last_move_time >= sim.move_delay:
+            move = bot.decide_move(sim)
+        lives = player.lives
+        sim.step(move)
+        if player.lives < lives:
+            catches += 1
+            if first_catch is None:
+                first_catch = sim.sim_time
+
+    return {
+        'config': config,
+        'maze_size': maze_size,
+        'seed': seed,
+        'pellet_quota': pellet_quota,
+        'pellets_collected': player.pellets_collected,
+        'catches': catches,
+        'time_to_catch': first_catch,
+        'victory': sim.victory,
+        'player_dead': sim.game_over and not sim.victory,
+        'duration': sim.sim_time,
+        'latencies': [timed.latencies for timed in timed_ais],  # Per ghost; specs may repeat
+    }
+
+
+def _play_match_args(args):
+    return play_match(*args)
+
+
+def summarize(config, results):
+    """Aggregate the matches of one configuration into a report row."""
+    catch_times = [r['time_to_catch'] for r in results if r['time_to_catch'] is not None]
+    row = {
+        'config': config,
+        'matches': len(results),
+        'pellet_quota': results[0]['pellet_quota'],
+        'mean_pellets_collected': float(np.mean([r['pellets_collected'] for r in results])),
+        'catch_rate': sum(r['catches'] > 0 for r in results) / len(results),
+        'catches_per_match': float(np.mean([r['catches'] for r in results])),
+        'mean_time_to_catch_s': float(np.mean(catch_times)) / 1000 if catch_times else None,
+        'player_win_rate': sum(r['victory'] for r in results) / len(results),
+        'player_death_rate': sum(r['player_dead'] for r in results) / len(results),
+        'mean_match_s': float(np.mean([r['duration'] for r in results])) / 1000,
+    }
+    for i, spec in enumerate(config.split(',')):
+        latencies = [t for r in results for t in r['latencies'][i]]
+        if latencies:
+            row[f'ghost{i}_{spec}_latency_mean_ms'] = float(np.mean(latencies)) * 1000
+            row[f'ghost{i}_{spec}_latency_p95_ms'] = float(np.percentile(latencies, 95)) * 1000
+    return row
+
+
+def run_tournament(configs, matches, sizes, seed=0, max_seconds=120, workers=None, pellet_quota=5):
+    tasks = [(config, sizes[i % len(sizes)], seed + i, max_seconds, pellet_quota)
+             for config in configs for i in range(matches)]
+    results = {config: [] for config in configs}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8))
+        for result in pool.map(_play_match_args, tasks, chunksize=chunksize):
+            results[result['config']].append(result)
+    return [summarize(config, results[config]) for config in configs]
+
+
+def write_report(rows, path):
+    if path.endswith('.csv'):
+        fields = []
+        for row in rows:
+            fields += [key for key in row if key not in fields]
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless matches for ghost AI configurations.")
+    parser.add_argument('--config', action='append', required=True,
+                        help="comma-separated ghost specs, e.g. minimax:2,a_star (repeatable)")
+    parser.add_argument('--matches', type=int, default=100, help="matches per configuration")
+    parser.add_argument('--sizes', default='15', help="comma-separated maze sizes to cycle through")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first match")
+    parser.add_argument('--max-seconds', type=float, default=120, help="simulated time limit per match")
+    parser.add_argument('--pellets', type=int, default=5,
+                        help="pellets the bot collects before heading for the destination")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--out', default='tournament.json', help="report path (.csv or .json)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    rows = run_tournament(args.config, args.matches, sizes, args.seed, args.max_seconds, args.workers,
+                          args.pellets)
+    write_report(rows, args.out)
+
+    print(f"bot objective: {args.pellets} pellets, then the destination")
+    for row in rows:
+        print(f"{row['config']}: catch rate {row['catch_rate']:.2f}, "
+              f"player win rate {row['player_win_rate']:.2f}, "
+              f"{row['catches_per_match']:.2f} catches/match")
+    print(f"{len(args.config) * args.matches} matches in {time.perf_counter() - start:.1f}s, "
+          f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())